@@ -12,8 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import logging
+from functools import cached_property
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
 
 import yaml
 from pydantic import BaseModel, Field
@@ -26,6 +28,11 @@ from pydantic_settings import (
 # 这会导致 mypy 无法分析其类型。我们添加 # type: ignore 来告知 mypy 跳过对这一行的检查。
 from qcloud_cos import CosConfig  # type: ignore[import-untyped]
 
+logger = logging.getLogger(__name__)
+
+# 优先使用 libyaml 提供的 C 实现加载器，未编译 libyaml 时回退到纯 Python 实现
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 # 定义与 YAML 和 .env 文件结构匹配的 Pydantic 模型
 
 
@@ -38,11 +45,37 @@ class ElasticsearchSettings(BaseModel):
     index_max_result_window: int
     index_refresh_interval: str
     index_option_type: str
-    index_option_m: int
-    index_option_ef_construction: int
+    index_option_m: int = Field(
+        16, ge=2, description="HNSW 图中每个节点的最大邻居数（ES 默认 16）"
+    )
+    index_option_ef_construction: int = Field(
+        100, ge=1, description="HNSW 构建时考虑的候选邻居数（ES 默认 100）"
+    )
     metadata_index_suffix: str
     chunk_index_suffix: str
     request_timeout: int = 15
+    bulk_thread_count: int = Field(4, description="parallel_bulk 写入线程数")
+    bulk_chunk_size: int = Field(500, description="每个 bulk 请求包含的文档数")
+    bulk_max_chunk_bytes: int = Field(
+        5 * 1024 * 1024, description="每个 bulk 请求体的最大字节数"
+    )
+    chunk_index_refresh_interval: str | None = Field(
+        None,
+        description="分块索引的 refresh_interval，未配置时使用 index_refresh_interval；"
+        "写入以 refresh=wait_for 等待刷新，调大会增加每篇文档的入库延迟",
+    )
+    chunk_index_translog_durability: str = Field(
+        "request",
+        description="分块索引 translog 持久化方式：request（默认，每次请求 fsync）"
+        "或 async（定时 fsync，节点崩溃时可能丢失最近已确认的写入）",
+    )
+    chunk_index_translog_flush_threshold_size: str = Field(
+        "1gb", description="分块索引 translog 触发 flush 的大小阈值"
+    )
+    http_compress: bool = Field(True, description="是否对请求体启用 gzip 压缩")
+    connections_per_node: int = Field(
+        32, ge=1, description="每个 ES 节点的 HTTP 长连接池大小"
+    )
 
 
 class EmbedderSettings(BaseModel):
@@ -51,12 +84,30 @@ class EmbedderSettings(BaseModel):
     model_name: str
     dimensions: int
     similarity_metric: str
+    batch_size: int = Field(64, description="写入文档块时每批嵌入的文本数")
+    workers: int = Field(
+        2, ge=1, description="写入文档块时并发嵌入的最大批次数"
+    )
+    query_cache_size: int = Field(
+        2048, ge=0, description="查询向量 LRU 缓存的最大条目数"
+    )
 
 
 class RerankerSettings(BaseModel):
     """重排模型相关配置"""
 
     model_name: str
+    backend: Literal["bge", "cosine"] = Field(
+        "bge",
+        description="重排实现：bge 使用交叉编码器，cosine 使用嵌入向量余弦相似度",
+    )
+    batch_size: int = Field(32, ge=1, description="每次前向推理的句对数量")
+    max_length: int = Field(
+        512, ge=1, description="查询与文本拼接后的最大 token 数"
+    )
+    device: str | None = Field(
+        None, description="推理设备，如 cpu、cuda；不配置时自动选择"
+    )
 
 
 class SplitterSettings(BaseModel):
@@ -81,6 +132,25 @@ class UploadSettings(BaseModel):
     supported_file_extensions: list[str] = Field(
         default=[".txt", ".md", ".pdf"], description="支持上传的文件扩展名列表"
     )
+    index_workers: int = Field(
+        2, ge=1, description="并发执行后台索引任务的线程数"
+    )
+    index_queue_size: int = Field(
+        1024, ge=1, description="已提交但未完成的索引任务上限，超出时拒绝上传"
+    )
+    task_status_ttl_seconds: int = Field(
+        3600,
+        ge=1,
+        description="任务状态的保留时间（单位：秒），过期后查询返回 not_found",
+    )
+    task_status_max_entries: int = Field(
+        10000, ge=1, description="最多保留的任务状态条数，超出时淘汰最旧的状态"
+    )
+
+    @cached_property
+    def extensions_set(self) -> frozenset[str]:
+        """小写化后的扩展名集合，供上传校验做 O(1) 成员判断"""
+        return frozenset(e.lower() for e in self.supported_file_extensions)
 
 
 class RetrievalSettings(BaseModel):
@@ -90,12 +160,17 @@ class RetrievalSettings(BaseModel):
     vector_weight: float = Field(2.0, description="向量搜索权重")
     vector_similarity: float = Field(0.7, description="相似度")
     text_weight: float = Field(1.0, description="文本搜索权重")
+    num_candidates_factor: int = Field(
+        2, ge=1, description="knn 候选数相对召回数量 k 的倍数"
+    )
+    min_num_candidates: int = Field(100, ge=1, description="knn 最小候选数")
 
 
 class SearchSettings(BaseModel):
     """搜索相关配置"""
 
     max_top_k: int = Field(50, description="最大top_k值限制")
+    max_batch_size: int = Field(10, description="批量搜索单次最多包含的查询数")
 
 
 class TencentOssSettings(BaseModel):
@@ -129,16 +204,16 @@ class Settings(BaseSettings):
     retrieval: RetrievalSettings
     search: SearchSettings
 
-    @property
+    @cached_property
     def cos_config(self) -> CosConfig:
         """
-        根据原始配置动态创建并返回一个 `CosConfig` 对象。
+        根据原始配置创建并缓存一个 `CosConfig` 对象，重复访问不会重新构建。
         由于Pydantic的模型验证确保了`tencent_oss`及其所有字段都存在，这里无需进行任何检查。
 
         Returns:
             一个 `CosConfig` 实例。
         """
-        print(self.tencent_oss)
+        logger.debug("创建COS配置: region=%s", self.tencent_oss.region)
         return CosConfig(
             Region=self.tencent_oss.region,
             SecretId=self.tencent_oss.secret_id,
@@ -177,8 +252,8 @@ def create_settings() -> Settings:
 
     if config_path.is_file():
         try:
-            with open(config_path, encoding="utf-8") as f:
-                yaml_config = yaml.safe_load(f) or {}
+            with open(config_path, "rb") as f:
+                yaml_config = yaml.load(f, Loader=_YAML_LOADER) or {}  # noqa: S506
                 print(f"✅ 成功加载 {config_type} YAML 配置文件: {config_path}")
                 print(f"   配置字段: {list(yaml_config.keys())}")
         except Exception as e:
@@ -190,8 +265,8 @@ def create_settings() -> Settings:
             fallback_path = project_root / "config.yaml"
             if fallback_path.is_file():
                 try:
-                    with open(fallback_path, encoding="utf-8") as f:
-                        yaml_config = yaml.safe_load(f) or {}
+                    with open(fallback_path, "rb") as f:
+                        yaml_config = yaml.load(f, Loader=_YAML_LOADER) or {}  # noqa: S506
                         print(f"🔄 回退使用生产配置文件: {fallback_path}")
                 except Exception as e:
                     print(f"❌ 回退配置文件也读取失败: {e}")
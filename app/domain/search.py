@@ -25,7 +25,7 @@ class SearchMode(str, Enum):
     MATCH = "match"  # 模糊匹配
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SearchCondition:
     """搜索条件 - 值对象"""
 
@@ -34,7 +34,7 @@ class SearchCondition:
     value: str | int | float | bool
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SearchParameters:
     """搜索参数 - 值对象"""
 
@@ -44,7 +44,7 @@ class SearchParameters:
     filters: dict[str, Any] | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class DocumentResult:
     """文档结果 - 值对象"""
 
@@ -53,7 +53,7 @@ class DocumentResult:
     id: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class SearchResult:
     """搜索结果 - 聚合根"""
 
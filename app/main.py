@@ -15,20 +15,25 @@
 import logging
 import os
 import sys
+import threading
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 
 from elasticsearch import Elasticsearch
+from elasticsearch.serializer import OrjsonSerializer
 
 # 【修复】从 fastapi 导入 Request
 from fastapi import APIRouter, FastAPI, Request
+from fastapi.responses import ORJSONResponse
 from qcloud_cos import CosS3Client  # type: ignore[import-untyped]
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from app.config.settings import settings
 from app.service.elasticsearch import ElasticsearchService
 from app.utils.embedders.sentence_transformer import SentenceTransformerEmbedder
 from app.utils.loaders.dispatcher import DispatcherLoader
 from app.utils.rerankers.bge import BgeReranker
+from app.utils.rerankers.cosine import CosineReranker
 from app.utils.splitters import RecursiveCharacterTextSplitter
 from app.web.document import DocumentHandler
 
@@ -45,12 +50,32 @@ try:
     es_client = Elasticsearch(
         hosts=[settings.elasticsearch.url],
         request_timeout=settings.elasticsearch.request_timeout,
+        # 向量写入的请求体较大，gzip 可明显减少网络传输
+        http_compress=settings.elasticsearch.http_compress,
+        connections_per_node=settings.elasticsearch.connections_per_node,
+        # orjson 序列化器可直接序列化 numpy 向量，避免逐个 float 的 Python 转换
+        serializer=OrjsonSerializer(),
     )
     embedder = SentenceTransformerEmbedder(
         model_name=settings.embedder.model_name,
         similarity=settings.embedder.similarity_metric,
     )
-    reranker = BgeReranker(model_name=settings.reranker.model_name)
+    # 提前声明类型：余弦重排器在服务创建前构造，并在搜索时回调服务的查询向量缓存
+    es_service: ElasticsearchService
+    reranker: BgeReranker | CosineReranker
+    if settings.reranker.backend == "cosine":
+        # 低延迟路径：按余弦相似度重排，无需加载交叉编码器。候选块使用 ES 中存储的向量，
+        # 查询向量复用搜索服务的缓存（调用发生在搜索时，此时 es_service 已创建）
+        reranker = CosineReranker(
+            embed_query=lambda query: es_service.embed_query(query)
+        )
+    else:
+        reranker = BgeReranker(
+            model_name=settings.reranker.model_name,
+            batch_size=settings.reranker.batch_size,
+            max_length=settings.reranker.max_length,
+            device=settings.reranker.device,
+        )
     splitter = RecursiveCharacterTextSplitter(
         chunk_size=settings.splitter.chunk_size,
         chunk_overlap=settings.splitter.chunk_overlap,
@@ -79,19 +104,40 @@ is_testing = (
     or "test" in sys.argv[0].lower()
 )
 
-try:
-    logger.info("正在初始化腾讯云COS客户端...")
-    cos_config = settings.cos_config
-    print(cos_config)
-    cos_client = CosS3Client(cos_config)
-except Exception as e:
-    logger.critical(
-        f"❌ 腾讯云COS客户端初始化失败 (请检查密钥、存储桶、区域或网络连接): {e}",
-        exc_info=True,
-    )
-    raise RuntimeError(
-        "腾讯云COS客户端初始化失败 (请检查密钥、存储桶、区域或网络连接)"
-    ) from e
+
+class LazyCosClient:
+    """
+    腾讯云COS客户端的延迟初始化代理。
+    首次访问客户端属性（如 head_object、download_file）时才真正创建 CosS3Client，
+    避免只提供健康检查等接口的实例在启动时付出初始化成本。
+    """
+
+    def __init__(self) -> None:
+        self._client: CosS3Client | None = None
+        self._lock = threading.Lock()
+
+    def _get(self) -> CosS3Client:
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    try:
+                        logger.info("正在初始化腾讯云COS客户端...")
+                        self._client = CosS3Client(settings.cos_config)
+                    except Exception as e:
+                        logger.critical(
+                            f"❌ 腾讯云COS客户端初始化失败 (请检查密钥、存储桶、区域或网络连接): {e}",
+                            exc_info=True,
+                        )
+                        raise RuntimeError(
+                            "腾讯云COS客户端初始化失败 (请检查密钥、存储桶、区域或网络连接)"
+                        ) from e
+        return self._client
+
+    def __getattr__(self, name: str) -> object:
+        return getattr(self._get(), name)
+
+
+cos_client = LazyCosClient()
 
 # 组装Web层和API路由
 logger.info("正在组装Web层和API路由...")
@@ -136,6 +182,8 @@ app = FastAPI(
     description="基于Elasticsearch的RAG知识库系统",
     version="0.1.0",
     lifespan=lifespan,
+    # 搜索结果可能包含大量命中，使用 orjson 直接序列化为 bytes
+    default_response_class=ORJSONResponse,
     docs_url="/docs",
     redoc_url="/redoc",
 )
@@ -143,6 +191,51 @@ app = FastAPI(
 # 包含已配置好的路由
 app.include_router(api_router_v2, prefix="/api/v1", tags=["RAG API v1"])
 
+# multipart 表单中除文件内容外的边界、字段等额外开销
+_UPLOAD_FORM_OVERHEAD_BYTES = 1024 * 1024
+
+
+class UploadSizeLimitMiddleware:
+    """
+    上传接口在解析 multipart 表单之前按 Content-Length 拒绝过大的请求。
+    FastAPI 会在调用处理函数前读完整个请求体，仅靠处理函数内的检查无法提前中止。
+    实现为纯 ASGI 中间件：其他路径直接透传，不额外包装请求体或创建任务。
+    """
+
+    def __init__(self, app: ASGIApp, path_suffix: str, max_bytes: int) -> None:
+        self._app = app
+        self._path_suffix = path_suffix
+        self._max_bytes = max_bytes
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if scope["type"] == "http" and scope["path"].endswith(
+            self._path_suffix
+        ):
+            content_length = dict(scope["headers"]).get(b"content-length", b"")
+            if (
+                content_length.isdigit()
+                and int(content_length) > self._max_bytes
+            ):
+                response = ORJSONResponse(
+                    status_code=413,
+                    content={
+                        "detail": f"文件过大，最大支持{settings.upload.max_file_size_mb}MB"
+                    },
+                )
+                await response(scope, receive, send)
+                return
+        await self._app(scope, receive, send)
+
+
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    path_suffix="/documents/upload-file",
+    max_bytes=settings.upload.max_file_size_mb * 1024 * 1024
+    + _UPLOAD_FORM_OVERHEAD_BYTES,
+)
+
 
 # 定义根路径端点
 @app.get("/", tags=["Default"])
@@ -12,16 +12,23 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import functools
 import logging
 import os
+import threading
 import time
-from datetime import UTC, datetime
-from typing import Any, Protocol, cast
-
-from elastic_transport import ObjectApiResponse
-from elasticsearch import Elasticsearch
-from elasticsearch.helpers import bulk
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from operator import itemgetter
+from typing import TYPE_CHECKING, Any, Protocol, cast
+
+import numpy as np
+from elasticsearch import Elasticsearch, NotFoundError
+from elasticsearch.helpers import parallel_bulk
 from langchain_core.documents import Document as LangChainDocument
+from numpy.typing import NDArray
 
 from app.config.settings import Settings
 from app.domain.document import Document
@@ -33,6 +40,9 @@ from app.domain.search import (
     SearchResult,
 )
 
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
 logger = logging.getLogger(__name__)
 
 
@@ -54,7 +64,7 @@ class Splitter(Protocol):
 class Embedder(Protocol):
     """嵌入模型接口，负责将文本转换为向量。"""
 
-    def embed_documents(self, texts: list[str]) -> list[list[float]]: ...
+    def embed_documents(self, texts: list[str]) -> NDArray[np.float32]: ...
     @property
     def dimensions(self) -> int: ...
     @property
@@ -69,7 +79,58 @@ class Reranker(Protocol):
     ) -> list[DocumentResult]: ...
 
 
+# ES knn 查询允许的 num_candidates 上限
+_MAX_NUM_CANDIDATES = 10_000
+
+
+def _now_millis() -> int:
+    """当前 UTC 时间的毫秒时间戳"""
+    return time.time_ns() // 1_000_000
+
+
+# 从 ES 命中结果中批量取字段，避免逐个下标访问
+_ID_SOURCE_SCORE = itemgetter("_id", "_source", "_score")
+_SOURCE_SCORE = itemgetter("_source", "_score")
+
+
+@dataclass(slots=True)
+class ClassifiedConditions:
+    """按搜索模式分类后的搜索条件"""
+
+    vector: list[SearchCondition] = field(default_factory=list)
+    match: list[SearchCondition] = field(default_factory=list)
+    term: list[SearchCondition] = field(default_factory=list)
+
+    @property
+    def is_hybrid(self) -> bool:
+        """同时包含向量和全文条件时为向量+全文混合搜索"""
+        return bool(self.vector and self.match)
+
+    @property
+    def text_query(self) -> str:
+        """混合搜索中用于向量化和全文匹配的查询文本"""
+        return cast("str", self.vector[0].value)
+
+
 class ElasticsearchService:
+    # 搜索响应只保留结果转换需要的字段，减少传输和 JSON 解析开销
+    _SEARCH_FILTER_PATH = (
+        "hits.total.value",
+        "hits.hits._id",
+        "hits.hits._score",
+        "hits.hits._source",
+    )
+    # _msearch 保留每项的 status，确保无命中的查询不会因 filter_path 被整体省略
+    _MSEARCH_FILTER_PATH = (
+        "responses.status",
+        "responses.error.type",
+        "responses.error.reason",
+        "responses.hits.total.value",
+        "responses.hits.hits._id",
+        "responses.hits.hits._score",
+        "responses.hits.hits._source",
+    )
+
     def __init__(
         self,
         client: Elasticsearch,
@@ -85,6 +146,29 @@ class ElasticsearchService:
         self._embedder = embedder
         self._reranker = reranker
         self._settings = settings
+        # 索引的检查与创建由锁保护，避免并发的首次上传重复创建同一索引
+        self._index_creation_lock = threading.Lock()
+        # 查询向量缓存与服务实例（及其嵌入模型）同生命周期，重复查询无需再次推理
+        self._embed_query = functools.lru_cache(
+            maxsize=settings.embedder.query_cache_size
+        )(self._compute_query_embedding)
+
+    @property
+    def _reranks_by_stored_vectors(self) -> bool:
+        """余弦重排时需要在混合搜索结果中返回存储的块向量"""
+        return self._settings.reranker.backend == "cosine"
+
+    def embed_query(self, text_query: str) -> NDArray[np.float32]:
+        """返回查询文本的向量，命中缓存时不再推理；返回的数组为只读"""
+        return self._embed_query(text_query)
+
+    def _compute_query_embedding(self, text_query: str) -> NDArray[np.float32]:
+        """计算单条查询文本的向量，返回只读数组以便安全地被缓存复用"""
+        query_vector: NDArray[np.float32] = self._embedder.embed_documents(
+            [text_query]
+        )[0]
+        query_vector.flags.writeable = False
+        return query_vector
 
     def _metadata_index_name(self, index_prefix: str) -> str:
         return index_prefix + self._settings.elasticsearch.metadata_index_suffix
@@ -135,6 +219,7 @@ class ElasticsearchService:
 
     def _ensure_chunk_index_exists(self, chunk_index: str) -> None:
         """确保索引chunk_index存在"""
+        es_settings = self._settings.elasticsearch
         if not self._client.indices.exists(index=chunk_index):
             body = {
                 "settings": {
@@ -142,7 +227,12 @@ class ElasticsearchService:
                     "number_of_replicas": self._settings.elasticsearch.number_of_replicas,
                     "index": {
                         "max_result_window": self._settings.elasticsearch.index_max_result_window,
-                        "refresh_interval": self._settings.elasticsearch.index_refresh_interval,
+                        "refresh_interval": es_settings.chunk_index_refresh_interval
+                        or es_settings.index_refresh_interval,
+                        "translog": {
+                            "durability": es_settings.chunk_index_translog_durability,
+                            "flush_threshold_size": es_settings.chunk_index_translog_flush_threshold_size,
+                        },
                     },
                 },
                 "mappings": {
@@ -191,8 +281,11 @@ class ElasticsearchService:
         metadata_index = self._metadata_index_name(index_prefix)
         chunk_index = self._chunk_index_name(index_prefix)
 
-        self._ensure_metadata_index_exists(metadata_index)
-        self._ensure_chunk_index_exists(chunk_index)
+        # 每次写入都检查：索引可能已被外部删除，若跳过检查，ES 会在写入时按动态映射
+        # 自动重建索引，丢失分词器与 dense_vector 映射。相比整篇文档的嵌入，HEAD 开销可忽略
+        with self._index_creation_lock:
+            self._ensure_metadata_index_exists(metadata_index)
+            self._ensure_chunk_index_exists(chunk_index)
 
         return metadata_index, chunk_index
 
@@ -210,7 +303,11 @@ class ElasticsearchService:
         logger.info(
             f"向量混合搜索： 元数据索引名={metadata_index} 分片索引名={chunk_index}"
         )
-        metadata_id = self._create_metadata(metadata_index, document)
+        # 整个存储流程只取一次时间戳，元数据的创建与更新时间共用
+        now_millis = _now_millis()
+        metadata_id = self._create_metadata(
+            metadata_index, document, now_millis
+        )
         document.id = metadata_id  # 确保 document 对象持有 ID
         logger.info(f"元数据占位符创建成功，ID: {metadata_id}")
 
@@ -220,7 +317,6 @@ class ElasticsearchService:
             logger.info(f"成功存储 {created_chunks_count} 个文档块。")
 
             # Chunks 存储成功后，才更新元数据中的 total_chunks
-            now_millis = int(datetime.now(UTC).timestamp() * 1000)
             self._client.update(
                 index=metadata_index,
                 id=metadata_id,
@@ -235,7 +331,6 @@ class ElasticsearchService:
             logger.info(
                 f"元数据更新成功，total_chunks 已写入: {created_chunks_count}。"
             )
-            self._client.indices.refresh(index=chunk_index)
             return metadata_id
 
         except Exception as e:
@@ -248,12 +343,14 @@ class ElasticsearchService:
             # 重新抛出异常，让上层调用者知道操作失败
             raise RuntimeError("文档存储失败，已回滚。") from e
 
-    def _create_metadata(self, metadata_index: str, document: Document) -> str:
+    def _create_metadata(
+        self, metadata_index: str, document: Document, now_millis: int
+    ) -> str:
         """
         根据文档创建并存储元数据索引数据
+        :param now_millis: 写入 created_at / updated_at 的毫秒时间戳。
         :return: 在 file_metadatas 中生成的文档 ID。
         """
-        now_millis = int(datetime.now(UTC).timestamp() * 1000)
         doc = {
             "name": os.path.basename(document.path),
             "path": document.path,
@@ -270,7 +367,12 @@ class ElasticsearchService:
         return str(meta_response["_id"])
 
     def _create_chunks(self, chunk_index: str, document: Document) -> int:
-        """增强错误处理，支持部分回滚"""
+        """
+        切分、嵌入并批量写入文档块，失败时回滚已写入的块。
+
+        嵌入按小批次进行，并通过生成器交给 parallel_bulk 消费，
+        使得 ES 写入与下一批次的嵌入计算重叠，内存中只保留当前批次的向量。
+        """
         if not document.id:
             raise ValueError("文档ID未设置")
 
@@ -278,60 +380,107 @@ class ElasticsearchService:
         if not chunks:
             raise RuntimeError("未提取出任何文本块")
 
-        content_vectors = self._embedder.embed_documents(
-            [chunk.page_content for chunk in chunks]
-        )
-
-        chunk_docs = []
-        chunk_ids = []  # 记录已创建的chunk IDs
+        # 循环外预先计算不变量，减少每个块的属性查找
+        metadata_id = document.id
+        contents = [chunk.page_content for chunk in chunks]
 
-        try:
+        def generate_actions() -> Iterator[dict[str, Any]]:
             for i, (chunk, content_vector) in enumerate(
-                zip(chunks, content_vectors, strict=True)
+                zip(chunks, self._embed_in_batches(contents), strict=True)
             ):
-                doc = {
+                metadata = chunk.metadata
+                # 不指定 _id，由 ES 自动生成，省去写入时的 ID 唯一性检查
+                yield {
                     "_index": chunk_index,
-                    "_id": f"{document.id}_{i}",
-                    "file_metadata_id": document.id,
+                    "file_metadata_id": metadata_id,
                     "content": chunk.page_content,
                     "content_vector": content_vector,
                     "chunk_index": i,
                     "position": {
-                        "page_number": chunk.metadata.get("page"),
-                        "start_char_index": chunk.metadata.get("start_index"),
+                        "page_number": metadata.get("page"),
+                        "start_char_index": metadata.get("start_index"),
                     },
                 }
-                chunk_docs.append(doc)
-                chunk_ids.append(str(doc["_id"]))
 
-            success, failed = bulk(
+        try:
+            success = 0
+            failed = 0
+            first_error: Any = None
+            for ok, info in parallel_bulk(
                 client=self._client,
-                actions=chunk_docs,
-                stats_only=False,
+                actions=generate_actions(),
+                thread_count=self._settings.elasticsearch.bulk_thread_count,
+                chunk_size=self._settings.elasticsearch.bulk_chunk_size,
+                max_chunk_bytes=self._settings.elasticsearch.bulk_max_chunk_bytes,
                 raise_on_error=False,
-            )
+                # 等待下一次定时 refresh 后返回，而不是强制刷新整个索引
+                refresh="wait_for",
+            ):
+                if ok:
+                    success += 1
+                else:
+                    # 失败项中带有完整的原始文档（含向量），只保留计数与首个错误原因
+                    failed += 1
+                    if first_error is None:
+                        first_error = info.get("index", {}).get("error")
 
             if failed:
-                # 清理已成功写入的chunks
-                self._cleanup_chunks(chunk_index, chunk_ids[:success])
-                raise RuntimeError(f"批量写入失败: {failed}")
+                raise RuntimeError(
+                    f"批量写入失败 {failed} 个文档块，首个错误: {first_error}"
+                )
 
             return success
 
         except Exception:
             # 确保清理所有可能已写入的chunks
-            if chunk_ids:
-                self._cleanup_chunks(chunk_index, chunk_ids)
+            self._cleanup_chunks(chunk_index, metadata_id)
             raise
 
-    def _cleanup_chunks(self, chunk_index: str, chunk_ids: list[str]) -> None:
-        """清理指定的chunks"""
-        for chunk_id in chunk_ids:
-            try:
-                self._client.delete(index=chunk_index, id=chunk_id)
-            except Exception as e:
-                logger.error(f"删除文档分失败，错误: {e}。")
-                pass
+    def _embed_in_batches(
+        self, texts: list[str]
+    ) -> Iterator[NDArray[np.float32]]:
+        """
+        按批次并发嵌入文本，逐条按原顺序产出向量。
+
+        最多同时有 embedder.workers 个批次在线程池中计算，
+        既能与下游的 bulk 写入重叠，又不会一次性持有全部向量。
+        """
+        batch_size = self._settings.embedder.batch_size
+        workers = self._settings.embedder.workers
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending: deque[Future[NDArray[np.float32]]] = deque()
+            for start in range(0, len(texts), batch_size):
+                pending.append(
+                    executor.submit(
+                        self._embedder.embed_documents,
+                        texts[start : start + batch_size],
+                    )
+                )
+                if len(pending) >= workers:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+
+    def _cleanup_chunks(self, chunk_index: str, metadata_id: str) -> None:
+        """
+        按 file_metadata_id 清理该文档已写入的全部chunks。
+
+        parallel_bulk 中途抛出异常时，已写入批次的结果不会全部回传，
+        因此不能依赖返回的 ID 列表，而是按文档 ID 查询删除。
+        """
+        try:
+            # 先刷新，使尚未 refresh 的已写入块对 delete_by_query 可见
+            self._client.indices.refresh(index=chunk_index)
+            response = self._client.delete_by_query(
+                index=chunk_index,
+                query={"term": {"file_metadata_id": metadata_id}},
+                conflicts="proceed",
+                refresh=True,
+            )
+            if response.get("failures"):
+                logger.error(f"部分文档分块删除失败: {response['failures']}")
+        except Exception as e:
+            logger.error(f"删除文档分块失败，错误: {e}。")
 
     def search(self, parameters: SearchParameters) -> SearchResult:
         """
@@ -349,10 +498,11 @@ class ElasticsearchService:
         search_conditions = self._classify_conditions(parameters.conditions)
 
         # 根据条件类型构建查询
-        if search_conditions["vector"] and search_conditions["match"]:
+        if search_conditions.is_hybrid:
             # 向量+全文混合搜索（兼容旧版本）
+            query_vector = self._embed_query(search_conditions.text_query)
             search_body = self._build_hybrid_search_body(
-                parameters, search_conditions
+                parameters, search_conditions, query_vector
             )
         else:
             # 纯结构化搜索（新版本）
@@ -363,7 +513,9 @@ class ElasticsearchService:
         # 执行ES搜索
         logger.info(f"在 {parameters.index_name} 上执行查询: {search_body}")
         response = self._client.search(
-            index=parameters.index_name, body=search_body
+            index=parameters.index_name,
+            body=search_body,
+            filter_path=self._SEARCH_FILTER_PATH,
         )
         logger.info(f"查询结果: {response}")
         # 计算搜索耗时
@@ -371,9 +523,111 @@ class ElasticsearchService:
 
         # 转换为Domain对象并返回
         return self._convert_to_search_result(
-            response, search_time_ms, parameters.limit, search_conditions
+            response.body, search_time_ms, parameters.limit, search_conditions
         )
 
+    def search_batch(
+        self, parameters_list: list[SearchParameters]
+    ) -> list[SearchResult]:
+        """
+        批量执行搜索 - 多个查询合并为一次 _msearch 请求
+
+        所有混合搜索的查询文本去重后通过一次嵌入调用批量向量化，
+        所有查询体通过一次 _msearch 请求发送，重排仍按单个查询分别进行。
+
+        Args:
+            parameters_list: 搜索参数列表
+
+        Returns:
+            与参数列表一一对应的搜索结果
+
+        Raises:
+            NotFoundError: 任意一个查询的索引不存在时抛出
+            RuntimeError: 任意一个查询在ES端因其他原因执行失败时抛出
+        """
+        start_time = time.time()
+
+        classified = [
+            self._classify_conditions(parameters.conditions)
+            for parameters in parameters_list
+        ]
+
+        # 去重收集混合搜索的查询文本，一次批量推理完成全部向量化
+        text_queries = list(
+            dict.fromkeys(
+                conditions.text_query
+                for conditions in classified
+                if conditions.is_hybrid
+            )
+        )
+        query_vectors: dict[str, NDArray[np.float32]] = {}
+        if self._reranks_by_stored_vectors:
+            # 余弦重排会再次取查询向量，经由缓存计算使重排时直接命中
+            query_vectors = {
+                text_query: self._embed_query(text_query)
+                for text_query in text_queries
+            }
+        elif text_queries:
+            query_vectors = dict(
+                zip(
+                    text_queries,
+                    self._embedder.embed_documents(text_queries),
+                    strict=True,
+                )
+            )
+
+        searches: list[dict[str, Any]] = []
+        for parameters, search_conditions in zip(
+            parameters_list, classified, strict=True
+        ):
+            if search_conditions.is_hybrid:
+                search_body = self._build_hybrid_search_body(
+                    parameters,
+                    search_conditions,
+                    query_vectors[search_conditions.text_query],
+                )
+            else:
+                search_body = self._build_structured_search_body(
+                    parameters, search_conditions
+                )
+            searches.append({"index": parameters.index_name})
+            searches.append(search_body)
+
+        logger.info(f"执行批量查询，共 {len(parameters_list)} 个")
+        response = self._client.msearch(
+            searches=searches, filter_path=self._MSEARCH_FILTER_PATH
+        )
+        search_time_ms = int((time.time() - start_time) * 1000)
+
+        results: list[SearchResult] = []
+        for i, (item, parameters, search_conditions) in enumerate(
+            zip(
+                response.body["responses"],
+                parameters_list,
+                classified,
+                strict=True,
+            )
+        ):
+            error = item.get("error")
+            if error and error.get("type") == "index_not_found_exception":
+                # 与单条搜索一致，以 NotFoundError 抛出，由上层映射为 404
+                raise NotFoundError(
+                    message=f"索引 {parameters.index_name} 不存在",
+                    meta=replace(response.meta, status=404),
+                    body=item,
+                )
+            if error:
+                raise RuntimeError(
+                    f"批量搜索第 {i} 个查询失败 - 索引: {parameters.index_name}, "
+                    f"错误: {error.get('type')}: {error.get('reason')}"
+                )
+            results.append(
+                self._convert_to_search_result(
+                    item, search_time_ms, parameters.limit, search_conditions
+                )
+            )
+        return results
+
     def es_search(
         self, index_name: str, query: dict[str, Any]
     ) -> dict[str, Any]:
@@ -383,7 +637,7 @@ class ElasticsearchService:
     @staticmethod
     def _classify_conditions(
         conditions: list[SearchCondition],
-    ) -> dict[str, list[SearchCondition]]:
+    ) -> ClassifiedConditions:
         """
         按搜索模式分类条件
 
@@ -391,28 +645,24 @@ class ElasticsearchService:
             conditions: 搜索条件列表
 
         Returns:
-            分类后的条件字典
+            分类后的条件
         """
-        classified: dict[str, list[SearchCondition]] = {
-            "vector": [],
-            "match": [],
-            "term": [],
+        classified = ClassifiedConditions()
+        dispatch = {
+            SearchMode.VECTOR: classified.vector.append,
+            SearchMode.MATCH: classified.match.append,
+            SearchMode.TERM: classified.term.append,
         }
-
         for condition in conditions:
-            if condition.mode == SearchMode.VECTOR:
-                classified["vector"].append(condition)
-            elif condition.mode == SearchMode.MATCH:
-                classified["match"].append(condition)
-            elif condition.mode == SearchMode.TERM:
-                classified["term"].append(condition)
+            dispatch[condition.mode](condition)
 
         return classified
 
     def _build_hybrid_search_body(
         self,
         parameters: SearchParameters,
-        search_conditions: dict[str, list[SearchCondition]],
+        search_conditions: ClassifiedConditions,
+        query_vector: NDArray[np.float32],
     ) -> dict[str, Any]:
         """
         构建向量+全文混合搜索查询体（兼容旧版本）
@@ -420,15 +670,13 @@ class ElasticsearchService:
         Args:
             parameters: 搜索参数
             search_conditions: 分类后的搜索条件
+            query_vector: 查询文本对应的向量
 
         Returns:
             ES查询体
         """
-        # 获取文本查询进行向量化
-        text_query = cast("str", search_conditions["vector"][0].value)
-
-        # 生成查询向量
-        query_vector = self._embedder.embed_documents([text_query])[0]
+        # 获取文本查询
+        text_query = search_conditions.text_query
 
         # 计算召回数量（用于后续重排序）
         k = parameters.limit * self._settings.retrieval.multiplier
@@ -438,13 +686,25 @@ class ElasticsearchService:
         vector_weight = self._settings.retrieval.vector_weight
         text_weight = self._settings.retrieval.text_weight
 
-        # # 确保 num_candidates 至少为 k 的 2 倍或 100，取较大值
-        num_candidates = max(k * 2, 100)
+        # num_candidates 是 HNSW 每个分片的搜索宽度：越大召回率越高、延迟越高。
+        # 随召回数量 k 按比例变化并保证不低于配置的下限，同时不超过 ES 允许的上限
+        num_candidates = min(
+            max(
+                k * self._settings.retrieval.num_candidates_factor,
+                self._settings.retrieval.min_num_candidates,
+            ),
+            _MAX_NUM_CANDIDATES,
+        )
+
+        # 只返回需要的字段；余弦重排直接使用存储的块向量，无需重新推理
+        source_fields = ["content", "file_metadata_id"]
+        if self._reranks_by_stored_vectors:
+            source_fields.append("content_vector")
 
         # 构建混合搜索查询体
         search_body: dict[str, Any] = {
             "size": parameters.limit,
-            "_source": ["content", "file_metadata_id"],  # 只返回需要的字段
+            "_source": source_fields,
             "knn": {
                 "field": "content_vector",  # 固定向量字段
                 "query_vector": query_vector,
@@ -455,27 +715,18 @@ class ElasticsearchService:
             },
             "query": {
                 "bool": {
+                    # 单个 match 子句，查询串只分析一次、只遍历一次倒排表；
+                    # 短语相关性交由后续的重排模型处理
                     "must": [
                         {
                             "match": {
                                 "content": {
                                     "query": text_query,
-                                    "boost": text_weight * 0.7,  # 基础匹配权重
+                                    "boost": text_weight,
                                 }
                             }
                         }
                     ],
-                    "should": [
-                        {
-                            "match_phrase": {
-                                "content": {
-                                    "query": text_query,
-                                    "boost": text_weight * 0.3,  # 短语匹配加分
-                                }
-                            }
-                        }
-                    ],
-                    "minimum_should_match": 0,  # should是纯加分项
                 }
             },
         }
@@ -492,7 +743,7 @@ class ElasticsearchService:
     @staticmethod
     def _build_structured_search_body(
         parameters: SearchParameters,
-        search_conditions: dict[str, list[SearchCondition]],
+        search_conditions: ClassifiedConditions,
     ) -> dict[str, Any]:
         """
         构建结构化搜索查询体（新版本）
@@ -507,13 +758,13 @@ class ElasticsearchService:
         bool_query: dict[str, Any] = {"bool": {"must": []}}
 
         # 添加MATCH查询条件
-        for condition in search_conditions["match"]:
+        for condition in search_conditions.match:
             bool_query["bool"]["must"].append(
                 {"match": {condition.field_name: {"query": condition.value}}}
             )
 
         # 添加TERM查询条件
-        for condition in search_conditions["term"]:
+        for condition in search_conditions.term:
             bool_query["bool"]["must"].append(
                 {"term": {condition.field_name: condition.value}}
             )
@@ -531,16 +782,16 @@ class ElasticsearchService:
 
     def _convert_to_search_result(
         self,
-        response: ObjectApiResponse[Any],
+        response: dict[str, Any],
         search_time_ms: int,
         limit: int,
-        search_conditions: dict[str, list[SearchCondition]],
+        search_conditions: ClassifiedConditions,
     ) -> SearchResult:
         """
         将ES响应转换为Domain搜索结果
 
         Args:
-            response: ES查询响应
+            response: ES查询响应体（单次搜索或 _msearch 中的一项）
             search_time_ms: 搜索耗时（毫秒）
             limit: 限制返回结果的个数
             search_conditions: 分类后的搜索条件
@@ -548,22 +799,19 @@ class ElasticsearchService:
         Returns:
             SearchResult: Domain层搜索结果
         """
-        hits = response["hits"]["hits"]
+        # filter_path 会省略空数组，无命中时响应中不存在 hits.hits
+        hits_envelope = response.get("hits", {})
+        hits = hits_envelope.get("hits", [])
 
         # 获取总数
         total_count: int = 0
-        if isinstance(response["hits"]["total"], dict):
-            total_count = response["hits"]["total"]["value"]
-
-        # 判断是否为混合搜索
-        is_hybrid_search = bool(
-            search_conditions["vector"] and search_conditions["match"]
-        )
+        if isinstance(hits_envelope.get("total"), dict):
+            total_count = hits_envelope["total"]["value"]
 
         # 根据搜索类型处理结果
-        if is_hybrid_search:
+        if search_conditions.is_hybrid:
             documents = self._process_hybrid_search_results(
-                cast("str", search_conditions["vector"][0].value), hits
+                search_conditions.text_query, hits
             )
         else:
             documents = self._process_structured_search_results(hits)
@@ -589,29 +837,25 @@ class ElasticsearchService:
             处理后的文档结果列表
         """
 
+        # 去重处理：单次搜索不会重复返回同一 _id，需去重的是同一文件内容相同的块；
+        # 在原始命中上先去重，重复块不再构造结果对象
+        unique: dict[tuple[str, str], dict[str, Any]] = {}
+        for hit in hits:
+            source = hit["_source"]
+            unique.setdefault(
+                (source["file_metadata_id"], source["content"]), hit
+            )
+
         chunks = [
             DocumentResult(
-                content=hit["_source"],
-                score=hit["_score"] if hit["_score"] is not None else 0.0,
+                content=source,
+                score=score if score is not None else 0.0,
             )
-            for hit in hits
+            for source, score in map(_SOURCE_SCORE, unique.values())
         ]
 
-        # 去重处理
-        seen = set()
-        unique_chunks = []
-
-        for chunk in chunks:
-            identifier = (
-                chunk.content["content"],
-                chunk.content["file_metadata_id"],
-            )
-            if identifier not in seen:
-                seen.add(identifier)
-                unique_chunks.append(chunk)
-
         # 重排
-        return self._reranker.rerank(text_query, unique_chunks)
+        return self._reranker.rerank(text_query, chunks)
 
     @staticmethod
     def _process_structured_search_results(
@@ -626,16 +870,15 @@ class ElasticsearchService:
         Returns:
             文档结果列表
         """
-        documents = []
-        for hit in hits:
-            documents.append(
-                DocumentResult(
-                    id=hit["_id"],  # 使用ES文档ID
-                    content=hit["_source"],  # 完整文档内容
-                    score=hit["_score"] if hit["_score"] is not None else 0.0,
-                )
+        # 使用ES文档ID与完整文档内容
+        return [
+            DocumentResult(
+                id=doc_id,
+                content=source,
+                score=score if score is not None else 0.0,
             )
-        return documents
+            for doc_id, source, score in map(_ID_SOURCE_SCORE, hits)
+        ]
 
     def save_for_structured_search(
         self, index_name: str, doc_id: str, doc_dict: dict[str, Any]
@@ -10,6 +10,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from itertools import chain
+
 from app.domain.search import (
     SearchCondition,
     SearchMode,
@@ -34,25 +36,26 @@ class SearchConverter:
         """VO转Domain"""
 
         if request.type == SearchType.VECTOR_HYBRID:
-            # 向量混合：生成双条件
-            conditions: list[SearchCondition] = []
-            for cond in request.query.conditions:
-                # 文本搜索条件
-                conditions.append(
-                    SearchCondition(
-                        field_name=cond.field,
-                        mode=SearchMode.MATCH,
-                        value=cond.value,
-                    )
-                )
-                # 向量搜索条件（value还是文本）
-                conditions.append(
-                    SearchCondition(
-                        field_name=f"{cond.field}_vector",
-                        mode=SearchMode.VECTOR,
-                        value=cond.value,
+            # 向量混合：每个条件生成文本与向量双条件，一次展开构造列表
+            conditions = list(
+                chain.from_iterable(
+                    (
+                        # 文本搜索条件
+                        SearchCondition(
+                            field_name=cond.field,
+                            mode=SearchMode.MATCH,
+                            value=cond.value,
+                        ),
+                        # 向量搜索条件（value还是文本）
+                        SearchCondition(
+                            field_name=f"{cond.field}_vector",
+                            mode=SearchMode.VECTOR,
+                            value=cond.value,
+                        ),
                     )
+                    for cond in request.query.conditions
                 )
+            )
         else:
             # 结构化搜索：直接映射
             conditions = [
@@ -79,12 +82,16 @@ class SearchConverter:
     def result_domain_to_vo(
         search_result: SearchResult, search_type: SearchType
     ) -> SearchResponse:
-        """Domain转VO"""
+        """
+        Domain转VO
+
+        结果字段均来自服务端ES响应，类型已确定，使用 model_construct 跳过逐字段校验
+        """
         results: list[VectorHybridSearchResult | StructuredSearchResult]
 
         if search_type == SearchType.VECTOR_HYBRID:
             results = [
-                VectorHybridSearchResult(
+                VectorHybridSearchResult.model_construct(
                     text=doc.content.get("content", ""),
                     file_metadata_id=doc.content.get("file_metadata_id", ""),
                     score=doc.score,
@@ -93,7 +100,7 @@ class SearchConverter:
             ]
         else:
             results = [
-                StructuredSearchResult(
+                StructuredSearchResult.model_construct(
                     id=doc.id,
                     document=doc.content,
                     score=doc.score,
@@ -102,4 +109,4 @@ class SearchConverter:
                 if doc.id
             ]
 
-        return SearchResponse(results=results)
+        return SearchResponse.model_construct(results=results)
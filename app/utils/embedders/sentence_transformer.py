@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import numpy as np
+from numpy.typing import NDArray
 from sentence_transformers import SentenceTransformer
 
 
@@ -23,20 +25,19 @@ class SentenceTransformerEmbedder:
         :param similarity: 相似性算法名称 cosine，dot_product
         """
         self.model = SentenceTransformer(model_name)
-        self._similarity = similarity
-
-    def embed_documents(self, texts: list[str]) -> list[list[float]]:
-        return [embedding.tolist() for embedding in self.model.encode(texts)]
-
-    @property
-    def dimensions(self) -> int:
+        # 维度与相似度算法在模型加载后即固定，初始化时计算一次并作为普通属性暴露
         d = self.model.get_sentence_embedding_dimension()
         if d is None:
             raise RuntimeError(
                 "SentenceTransformerEmbedder: dimension cannot be None"
             )
-        return d
+        self.dimensions: int = d
+        self.similarity_metric: str = similarity
 
-    @property
-    def similarity_metric(self) -> str:
-        return self._similarity
+    def embed_documents(self, texts: list[str]) -> NDArray[np.float32]:
+        """
+        返回 float32 的二维向量矩阵，不再转换为 Python 列表，
+        由 ES 客户端的 orjson 序列化器直接序列化 numpy 数组。
+        """
+        embeddings = self.model.encode(texts, convert_to_numpy=True)
+        return np.asarray(embeddings, dtype=np.float32)
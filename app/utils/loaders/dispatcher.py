@@ -13,40 +13,61 @@
 # limitations under the License.
 
 import os
+from collections.abc import Callable
+from typing import Any
 
 from langchain_community.document_loaders import (
     PyPDFLoader,
     TextLoader,
     UnstructuredMarkdownLoader,
 )
+from langchain_core.document_loaders import BaseLoader
 from langchain_core.documents import Document as LangChainDocument
 
 from app.domain.document import Document
 
 
+def _text_loader(path: str, loader_args: dict[str, Any]) -> BaseLoader:
+    args = loader_args.get("txt", {"encoding": "utf-8"})
+    return TextLoader(path, encoding=args["encoding"])
+
+
+def _markdown_loader(path: str, loader_args: dict[str, Any]) -> BaseLoader:
+    # 如果 'markdown_load_args' 未提供，则默认为 'elements'
+    args = loader_args.get("markdown", {"mode": "elements"})
+    return UnstructuredMarkdownLoader(path, mode=args["mode"])
+
+
+def _pdf_loader(path: str, loader_args: dict[str, Any]) -> BaseLoader:
+    args = loader_args.get("pdf", {})
+    return PyPDFLoader(path, **args)
+
+
+# 文件后缀 -> Loader 构造函数，一次字典查找完成分发
+_LOADERS: dict[str, Callable[[str, dict[str, Any]], BaseLoader]] = {
+    ".txt": _text_loader,
+    ".md": _markdown_loader,
+    ".pdf": _pdf_loader,
+}
+
+
 class DispatcherLoader:
     """DispatcherLoader 根据文件后缀分发到正确的Loader。"""
 
     @staticmethod
     def load(document: Document) -> list[LangChainDocument]:
-        # 添加文件存在性检查
-        if not os.path.exists(document.path):
-            raise FileNotFoundError(f"文件不存在: {document.path}")
-
         ext = os.path.splitext(document.path)[1].lower()
+        create_loader = _LOADERS.get(ext)
+        if create_loader is None:
+            raise ValueError(f"不支持的文件类型: {ext}")
         # 获取 loader 特定的参数，提供默认值
-        loader_args = document.loader_args or {}
-        if ext == ".txt":
-            args = loader_args.get("txt", {"encoding": "utf-8"})
-            return TextLoader(document.path, encoding=args["encoding"]).load()
-        elif ext == ".md":
-            # 如果 'markdown_load_args' 未提供，则默认为 'elements'
-            args = loader_args.get("markdown", {"mode": "elements"})
-            return UnstructuredMarkdownLoader(
-                document.path, mode=args["mode"]
+        try:
+            return create_loader(
+                document.path, document.loader_args or {}
             ).load()
-        elif ext == ".pdf":
-            args = loader_args.get("pdf", {})
-            return PyPDFLoader(document.path, **args).load()
-        else:
-            raise ValueError(f"不支持的文件类型: {ext}")
+        except Exception as e:
+            # 仅在加载失败时检查文件是否存在，正常路径省去一次 stat 调用；
+            # 各 Loader 对缺失文件抛出的异常类型不一，这里统一为 FileNotFoundError
+            if not os.path.isfile(document.path):
+                raise FileNotFoundError(f"文件不存在: {document.path}") from e
+            raise
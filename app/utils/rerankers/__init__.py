@@ -17,5 +17,6 @@
 """
 
 from .bge import BgeReranker
+from .cosine import CosineReranker
 
-__all__ = ["BgeReranker"]
+__all__ = ["BgeReranker", "CosineReranker"]
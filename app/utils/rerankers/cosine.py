@@ -0,0 +1,72 @@
+# Copyright 2021 ecodeclub
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http:#www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections.abc import Callable
+
+import numpy as np
+from numpy.typing import NDArray
+
+from app.domain.search import DocumentResult
+
+
+class CosineReranker:
+    """
+    基于向量余弦相似度的轻量重排器。
+
+    候选块向量直接取自 ES 中存储的 content_vector（需在查询的 _source 中返回），
+    只需计算查询向量，在连续的 float32 矩阵上一次矩阵乘法完成打分，
+    无需加载交叉编码器，适用于对延迟敏感、可接受较低精度的场景。
+    """
+
+    def __init__(
+        self, embed_query: Callable[[str], NDArray[np.float32]]
+    ) -> None:
+        """
+        :param embed_query: 将查询文本转换为一维 float32 向量的函数，通常带缓存。
+        """
+        self._embed_query = embed_query
+
+    def rerank(
+        self, query: str, results: list[DocumentResult]
+    ) -> list[DocumentResult]:
+        if not results:
+            return results
+
+        # 取出存储的块向量，同时将其从返回给调用方的内容中移除
+        chunk_vectors = np.asarray(
+            [chunk.content.pop("content_vector") for chunk in results],
+            dtype=np.float32,
+        )
+        if not query:
+            return results
+        query_vector = np.asarray(self._embed_query(query), dtype=np.float32)
+
+        norms = np.linalg.norm(chunk_vectors, axis=1) * np.linalg.norm(
+            query_vector
+        )
+        # 零向量的相似度记为 0，避免除零
+        scores = np.divide(
+            chunk_vectors @ query_vector,
+            norms,
+            out=np.zeros(len(results), dtype=np.float32),
+            where=norms > 0,
+        )
+
+        # 将新的rerank分数写回结果
+        for doc, score in zip(results, scores.tolist(), strict=True):
+            doc.score = score
+
+        # 根据新的rerank分数降序排序
+        results.sort(key=lambda x: x.score, reverse=True)
+        return results
@@ -12,9 +12,25 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import functools
+
 import langchain_text_splitters
 from langchain_core.documents import Document as LangChainDocument
 
+_DEFAULT_SEPARATORS = ("\n\n", "\n", "。", "！", "？", "；", "，", " ", "")
+
+
+@functools.lru_cache(maxsize=32)
+def _get_splitter(
+    chunk_size: int, chunk_overlap: int, separators: tuple[str, ...]
+) -> langchain_text_splitters.RecursiveCharacterTextSplitter:
+    """相同参数的切分器无状态、可复用，按参数缓存，所有文档共享同一个实例"""
+    return langchain_text_splitters.RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        separators=list(separators),
+    )
+
 
 class RecursiveCharacterTextSplitter:
     def __init__(
@@ -23,17 +39,13 @@ class RecursiveCharacterTextSplitter:
         chunk_overlap: int,
         separators: list[str] | None = None,
     ) -> None:
-        if separators is None:
-            separators = ["\n\n", "\n", "。", "！", "？", "；", "，", " ", ""]
-        self._splitter = (
-            langchain_text_splitters.RecursiveCharacterTextSplitter(
-                chunk_size=chunk_size,
-                chunk_overlap=chunk_overlap,
-                separators=separators,
-            )
+        self._key = (
+            chunk_size,
+            chunk_overlap,
+            _DEFAULT_SEPARATORS if separators is None else tuple(separators),
         )
 
     def split_documents(
         self, documents: list[LangChainDocument]
     ) -> list[LangChainDocument]:
-        return self._splitter.split_documents(documents)
+        return _get_splitter(*self._key).split_documents(documents)
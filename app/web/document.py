@@ -14,19 +14,27 @@
 
 import asyncio
 import logging
+import os
+import re
 import shutil
+import threading
+import time
 import uuid
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, BinaryIO
 from urllib.parse import urlparse
 
 from elasticsearch import NotFoundError
 from fastapi import (
     APIRouter,
-    BackgroundTasks,
     File,
     Form,
     HTTPException,
+    Query,
     UploadFile,
 )
 
@@ -39,6 +47,8 @@ from app.domain.document import Document
 from app.service.elasticsearch import ElasticsearchService
 from app.utils.converters import SearchConverter
 from app.web.vo import (
+    BatchSearchRequest,
+    BatchSearchResponse,
     ESSearchRequest,
     FileUploadResponse,
     SaveRequest,
@@ -49,8 +59,38 @@ from app.web.vo import (
     UrlUploadResponse,
 )
 
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from pydantic import BaseModel
+
 logger = logging.getLogger(__name__)
 
+# 上传、下载文件流式写盘时每次读取的字节数
+_STREAM_CHUNK_SIZE = 1 << 16
+
+# 查询任务状态时允许长轮询等待的最长秒数
+_MAX_TASK_WAIT_SECONDS = 60.0
+
+# 任务尚未结束时的状态，长轮询只在这些状态下继续等待
+_UNSETTLED_TASK_STATUSES = frozenset({"pending", "processing"})
+
+
+# 标签分隔符：逗号及其两侧的空白
+_TAG_SEPARATOR = re.compile(r"\s*,\s*")
+
+
+def _parse_tags(tags: str | None) -> list[str]:
+    """将逗号分隔的标签字符串一次性切分并去除空白，忽略空标签"""
+    if not tags:
+        return []
+    return [tag for tag in _TAG_SEPARATOR.split(tags.strip()) if tag]
+
+
+async def hello() -> dict[str, str]:
+    """欢迎接口，声明为协程避免每次请求占用线程池。"""
+    return {"message": "Hello, KBase RAG!"}
+
 
 class DocumentHandler:
     """
@@ -77,103 +117,233 @@ class DocumentHandler:
         self._service = search_service
         self._settings = settings
         self._cos_client = cos_client
-        self._storage_path = Path(settings.storage.local_path)
+        # 预先解析为绝对路径，之后拼接出的文件路径无需再逐个 resolve
+        self._storage_path = Path(settings.storage.local_path).resolve()
         self._storage_path.mkdir(parents=True, exist_ok=True)
         self._max_file_size_bytes = (
             settings.upload.max_file_size_mb * 1024 * 1024
         )
-        self._supported_file_extensions = set(
-            settings.upload.supported_file_extensions
+        self._supported_file_extensions = settings.upload.extensions_set
+        self._supported_file_extensions_hint = sorted(
+            self._supported_file_extensions
+        )
+        # COS存储桶域名由配置决定，构造时计算一次
+        self._expected_cos_domain = f"{settings.tencent_oss.bucket}.cos.{settings.tencent_oss.region}.myqcloud.com"
+        # 已结束任务的状态按写入顺序保存 (状态, 写入时间)，过期或超出容量时从最旧的开始淘汰，
+        # 避免长期运行时无限增长；读写来自事件循环与后台线程，需要加锁
+        self._task_status: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        # 未结束（排队中/处理中）任务的状态单独保存且不参与淘汰，
+        # 数量受索引队列容量限制，排队再久也不会被误报为 not_found
+        self._active_tasks: dict[str, str] = {}
+        self._task_status_lock = threading.Lock()
+        # 长轮询中的请求按任务等待事件循环上的 Event，任务结束时由后台线程
+        # 通过 call_soon_threadsafe 唤醒，等待期间不占用线程池中的线程
+        self._task_waiters: dict[
+            str, tuple[asyncio.AbstractEventLoop, asyncio.Event]
+        ] = {}
+        self._task_status_ttl = settings.upload.task_status_ttl_seconds
+        self._task_status_max_entries = settings.upload.task_status_max_entries
+        # 后台索引任务由固定大小的线程池执行，并限制排队任务数，
+        # 突发上传时不会同时启动大量嵌入计算而耗尽内存
+        self._index_executor = ThreadPoolExecutor(
+            max_workers=settings.upload.index_workers,
+            thread_name_prefix="kbase-index",
+        )
+        self._index_slots = threading.BoundedSemaphore(
+            settings.upload.index_queue_size
         )
-        self._task_status: dict[str, str] = {}
 
     def register_routes(self) -> None:
-        self._router.get("/hello", summary="健康检查接口")(
-            lambda: {"message": "Hello, KBase RAG!"}
-        )
         """将本处理器中的所有API端点注册到构造时传入的路由器上。"""
-
-        self._router.get("/health", summary="健康检查")(DocumentHandler.health)
-
-        self._router.get(
-            "/tasks/{task_id}",
-            summary="查询任务状态",
-        )(self.get_task_status)
-
-        self._router.post(
-            "/documents/upload-file",
-            response_model=FileUploadResponse,
-            summary="通过文件上传进行索引，可以假定索引已提前建好，只需要用前后缀拼接得到完整索引名称即可",
-        )(self.upload_file)
-
-        self._router.post(
-            "/documents/upload-from-url",
-            response_model=UrlUploadResponse,
-            summary="通过腾讯云COS URL下载并进行索引，可以假定索引已提前建好，只需要用前后缀拼接得到完整索引名称即可",
-        )(self.upload_from_url)
-
-        self._router.post(
-            "/search",
-            response_model=SearchResponse,
-            summary="在知识库中进行搜索",
-        )(self.search)
-
-        self._router.post(
-            "/es_search",
-            summary="使用传递过来的es查询语句在知识库中直接搜索",
-        )(self.es_search)
-
-        self._router.post(
-            "/documents/save",
-            response_model=SaveResponse,
-            summary="保存JSON格式文档到指定的Elasticsearch索引",
-        )(self.save)
+        # (方法, 路径, 处理函数, 响应模型, 摘要)；未声明响应模型的接口直接返回结果，
+        # 不再按返回类型注解推断模型并逐字段校验
+        routes: list[
+            tuple[str, str, Callable[..., Any], type[BaseModel] | None, str]
+        ] = [
+            ("GET", "/hello", hello, None, "健康检查接口"),
+            ("GET", "/health", DocumentHandler.health, None, "健康检查"),
+            (
+                "GET",
+                "/tasks/{task_id}",
+                self.get_task_status,
+                None,
+                "查询任务状态",
+            ),
+            (
+                "POST",
+                "/documents/upload-file",
+                self.upload_file,
+                FileUploadResponse,
+                "通过文件上传进行索引，可以假定索引已提前建好，只需要用前后缀拼接得到完整索引名称即可",
+            ),
+            (
+                "POST",
+                "/documents/upload-from-url",
+                self.upload_from_url,
+                UrlUploadResponse,
+                "通过腾讯云COS URL下载并进行索引，可以假定索引已提前建好，只需要用前后缀拼接得到完整索引名称即可",
+            ),
+            (
+                "POST",
+                "/search",
+                self.search,
+                SearchResponse,
+                "在知识库中进行搜索",
+            ),
+            (
+                "POST",
+                "/search/batch",
+                self.search_batch,
+                BatchSearchResponse,
+                "在知识库中批量搜索，多个查询合并为一次ES请求",
+            ),
+            (
+                "POST",
+                "/es_search",
+                self.es_search,
+                None,
+                "使用传递过来的es查询语句在知识库中直接搜索",
+            ),
+            (
+                "POST",
+                "/documents/save",
+                self.save,
+                SaveResponse,
+                "保存JSON格式文档到指定的Elasticsearch索引",
+            ),
+        ]
+        for method, path, endpoint, response_model, summary in routes:
+            self._router.add_api_route(
+                path,
+                endpoint,
+                methods=[method],
+                response_model=response_model,
+                summary=summary,
+            )
 
     @staticmethod
     async def health() -> dict[str, str]:
         """健康检查接口。"""
         return {"status": "healthy"}
 
-    async def get_task_status(self, task_id: str) -> dict[str, str]:
-        """查询任务状态"""
-        status = self._task_status.get(task_id, "not_found")
-        return {"task_id": task_id, "status": status}
+    async def get_task_status(
+        self,
+        task_id: str,
+        wait: float = Query(
+            0,
+            ge=0,
+            le=_MAX_TASK_WAIT_SECONDS,
+            description="任务未结束时最多等待的秒数，0 表示立即返回当前状态",
+        ),
+    ) -> dict[str, str]:
+        """查询任务状态，wait>0 时长轮询直到任务结束或超时"""
+        with self._task_status_lock:
+            status = self._lookup_task_status(task_id)
+            waiter = None
+            if wait > 0 and task_id in self._active_tasks:
+                # 检查状态与登记等待在同一把锁内完成，不会错过结束通知
+                waiter = self._task_waiters.setdefault(
+                    task_id, (asyncio.get_running_loop(), asyncio.Event())
+                )
+        if waiter is not None:
+            try:
+                await asyncio.wait_for(waiter[1].wait(), wait)
+            except TimeoutError:
+                pass
+            with self._task_status_lock:
+                status = self._lookup_task_status(task_id)
+        return {"task_id": task_id, "status": status or "not_found"}
+
+    def _lookup_task_status(self, task_id: str) -> str | None:
+        """返回任务的当前状态，未知或已过期时返回 None；调用方需持有状态锁"""
+        active_status = self._active_tasks.get(task_id)
+        if active_status is not None:
+            return active_status
+        entry = self._task_status.get(task_id)
+        if entry is None or time.monotonic() - entry[1] > self._task_status_ttl:
+            return None
+        return entry[0]
+
+    def _wake_task_waiters(self, task_id: str) -> None:
+        """唤醒等待该任务的长轮询请求，调用方需持有状态锁"""
+        waiter = self._task_waiters.pop(task_id, None)
+        if waiter is not None:
+            loop, event = waiter
+            loop.call_soon_threadsafe(event.set)
+
+    def _set_task_status(self, task_id: str, status: str) -> None:
+        """更新任务状态；任务结束时记录结果，并淘汰过期或超出容量的已结束状态"""
+        now = time.monotonic()
+        with self._task_status_lock:
+            if status in _UNSETTLED_TASK_STATUSES:
+                self._active_tasks[task_id] = status
+                return
+            self._active_tasks.pop(task_id, None)
+            self._task_status[task_id] = (status, now)
+            self._task_status.move_to_end(task_id)
+            while self._task_status:
+                _, written_at = next(iter(self._task_status.values()))
+                if (
+                    len(self._task_status) <= self._task_status_max_entries
+                    and now - written_at <= self._task_status_ttl
+                ):
+                    break
+                self._task_status.popitem(last=False)
+            self._wake_task_waiters(task_id)
 
     def _process_and_cleanup(
         self, task_id: str, temp_dir: Path, document: Document
     ) -> None:
         """后台任务函数：执行索引存储，并在完成后清理临时文件。"""
-        self._task_status[task_id] = "processing"
+        self._set_task_status(task_id, "processing")
         try:
             logger.info(f"后台任务开始处理: {document.path}")
             self._service.store_for_vector_hybrid_search(document)
             logger.info(f"✅ 后台任务成功处理文件: {document.path}")
-            self._task_status[task_id] = "completed"
+            self._set_task_status(task_id, "completed")
         except Exception as e:
             logger.error(
                 f"❌ 后台任务处理失败: {document.path}, 错误: {e}",
                 exc_info=True,
             )
-            self._task_status[task_id] = f"failed: {str(e)}"
+            self._set_task_status(task_id, f"failed: {str(e)}")
         finally:
             try:
                 shutil.rmtree(temp_dir)
                 logger.info(f"🧹 已清理临时目录: {temp_dir}")
             except OSError as e:
                 logger.error(f"❌ 清理临时目录失败: {temp_dir}, 错误: {e}")
+            self._index_slots.release()
 
-    async def _cleanup_task_status(
-        self, task_id: str, delay_seconds: int
+    def _submit_index_task(
+        self, task_id: str, temp_dir: Path, document: Document
     ) -> None:
-        """延迟清理任务状态"""
-        await asyncio.sleep(delay_seconds)
-        if task_id in self._task_status:
-            del self._task_status[task_id]
-            logger.info(f"🧹 已清理任务状态: {task_id}")
+        """将索引任务提交到后台线程池，队列已满时拒绝。"""
+        if not self._index_slots.acquire(blocking=False):
+            raise HTTPException(
+                status_code=503, detail="索引任务队列已满，请稍后重试"
+            )
+        self._set_task_status(task_id, "pending")
+        self._index_executor.submit(
+            self._process_and_cleanup, task_id, temp_dir, document
+        )
+
+    @asynccontextmanager
+    async def _temp_upload_dir(self) -> AsyncIterator[Path]:
+        """
+        为本次上传创建临时目录，目录名即任务ID。
+        块内出现任何异常时清理目录；正常退出后目录交由后台索引任务负责清理。
+        """
+        temp_dir = self._storage_path / str(uuid.uuid4())
+        temp_dir.mkdir(parents=True)
+        try:
+            yield temp_dir
+        except BaseException:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            raise
 
     async def upload_file(
         self,
-        background_tasks: BackgroundTasks,
         index_prefix: str = Form(
             ..., min_length=1, description="索引完整名称前缀"
         ),
@@ -193,12 +363,7 @@ class DocumentHandler:
         ):
             raise HTTPException(status_code=400, detail="文件名包含非法字符")
 
-        file_ext = Path(file.filename).suffix.lower()
-        if file_ext not in self._supported_file_extensions:
-            raise HTTPException(
-                status_code=400,
-                detail=f"不支持的文件类型: {file_ext}。支持的格式: {self._supported_file_extensions}",
-            )
+        self._check_extension(Path(file.filename))
 
         # 先检查文件大小（避免读取大文件到内存）
         if file.size and file.size > self._max_file_size_bytes:
@@ -207,48 +372,82 @@ class DocumentHandler:
                 detail=f"文件过大，最大支持{self._max_file_size_bytes // 1024 // 1024}MB",
             )
 
-        task_id = str(uuid.uuid4())
-        temp_dir = self._storage_path / task_id
-        temp_dir.mkdir(parents=True, exist_ok=True)
-        file_path = temp_dir / file.filename
-
-        try:
-            content = await file.read()
+        async with self._temp_upload_dir() as temp_dir:
+            file_path = temp_dir / file.filename
+            try:
+                # 分块流式写入磁盘，内存占用与文件大小无关；
+                # 整个拷贝在线程池中完成，不阻塞事件循环
+                file_size = await asyncio.to_thread(
+                    self._save_upload_file, file.file, file_path
+                )
+            except HTTPException:
+                raise
+            except Exception as e:
+                logger.error(f"保存上传文件失败: {e}", exc_info=True)
+                raise HTTPException(
+                    status_code=500, detail="保存上传文件失败"
+                ) from e
 
-            if len(content) == 0:
-                shutil.rmtree(temp_dir)
+            if file_size == 0:
                 raise HTTPException(status_code=400, detail="不能上传空文件")
 
-            # 双重检查（防止file.size不准确的情况）
-            if len(content) > self._max_file_size_bytes:
-                shutil.rmtree(temp_dir)
-                raise HTTPException(
-                    status_code=413,
-                    detail=f"文件过大，最大支持{self._max_file_size_bytes // 1024 // 1024}MB",
-                )
-            file_path.write_bytes(content)
-            file_size = file_path.stat().st_size
-        except HTTPException:
-            raise
-        except Exception as e:
-            shutil.rmtree(temp_dir)
-            logger.error(f"保存上传文件失败: {e}", exc_info=True)
-            raise HTTPException(
-                status_code=500, detail="保存上传文件失败"
-            ) from e
+            tag_list = _parse_tags(tags)
+            document = Document(
+                index_prefix=index_prefix,
+                path=str(file_path),
+                size=file_size,
+                category=category,
+                tags=tag_list,
+            )
+            self._submit_index_task(temp_dir.name, temp_dir, document)
+        return FileUploadResponse(task_id=temp_dir.name, message="ok")
 
-        tag_list = [tag.strip() for tag in tags.split(",")] if tags else []
-        document = Document(
-            index_prefix=index_prefix,
-            path=str(file_path.resolve()),
-            size=file_size,
-            category=category,
-            tags=tag_list,
-        )
-        background_tasks.add_task(
-            self._process_and_cleanup, task_id, temp_dir, document
+    def _save_upload_file(self, source: BinaryIO, file_path: Path) -> int:
+        """
+        将上传文件分块写入本地路径，并在写入过程中校验大小
+
+        Returns:
+            写入的字节数
+        """
+        return self._write_chunks(
+            iter(lambda: source.read(_STREAM_CHUNK_SIZE), b""), file_path
         )
-        return FileUploadResponse(task_id=task_id, message="ok")
+
+    def _write_chunks(self, chunks: Iterable[bytes], file_path: Path) -> int:
+        """
+        先写入同目录下的 .part 临时文件，完成后通过 os.replace 原子地重命名为目标文件，
+        中途失败或超限时目标路径上不会出现不完整的文件
+
+        Returns:
+            写入的字节数
+        """
+        part_path = file_path.with_name(file_path.name + ".part")
+        total = 0
+        try:
+            with part_path.open("wb") as f:
+                for chunk in chunks:
+                    total += len(chunk)
+                    # 双重检查（防止声明的大小不准确的情况），超限立即停止写入
+                    if total > self._max_file_size_bytes:
+                        raise HTTPException(
+                            status_code=413,
+                            detail=f"文件过大，最大支持{self._max_file_size_bytes // 1024 // 1024}MB",
+                        )
+                    f.write(chunk)
+            os.replace(part_path, file_path)
+        except BaseException:
+            part_path.unlink(missing_ok=True)
+            raise
+        return total
+
+    def _check_extension(self, path: Path) -> None:
+        """校验文件扩展名是否受支持，不支持时返回400"""
+        file_ext = path.suffix.lower()
+        if file_ext not in self._supported_file_extensions:
+            raise HTTPException(
+                status_code=400,
+                detail=f"不支持的文件类型: {file_ext}。支持的格式: {self._supported_file_extensions_hint}",
+            )
 
     def _validate_and_parse_cos_url(self, url: str) -> tuple[str, str]:
         """
@@ -261,7 +460,7 @@ class DocumentHandler:
             parsed_url = urlparse(url)
 
             # 验证URL域名安全性（防止SSRF攻击）
-            expected_domain = f"{self._settings.tencent_oss.bucket}.cos.{self._settings.tencent_oss.region}.myqcloud.com"
+            expected_domain = self._expected_cos_domain
             if parsed_url.netloc != expected_domain:
                 raise HTTPException(
                     status_code=400,
@@ -272,7 +471,8 @@ class DocumentHandler:
             if not cos_key:
                 raise HTTPException(status_code=400, detail="URL路径不能为空")
 
-            filename = Path(cos_key).name
+            key_path = Path(cos_key)
+            filename = key_path.name
 
             # 验证文件名安全性（防止路径遍历）
             if ".." in filename or not filename:
@@ -281,12 +481,7 @@ class DocumentHandler:
                 )
 
             # 验证文件扩展名
-            file_ext = Path(filename).suffix.lower()
-            if file_ext not in self._supported_file_extensions:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"不支持的文件类型: {file_ext}。支持的格式: {self._supported_file_extensions}",
-                )
+            self._check_extension(key_path)
 
             return cos_key, filename
 
@@ -297,76 +492,93 @@ class DocumentHandler:
                 status_code=400, detail=f"无效的URL格式: {e}"
             ) from e
 
-    async def _get_cos_object_metadata(
-        self, cos_key: str
+    @staticmethod
+    def _parse_cos_object_metadata(
+        metadata: dict[str, Any],
     ) -> tuple[int, str | None, list[str]]:
         """
-        获取COS对象元数据
+        解析COS对象元数据
 
         Returns:
             tuple[file_size, category, tag_list]: 文件大小、类别和标签列表
         """
+        # 安全地获取文件大小
+        content_length = metadata.get("Content-Length", "0")
         try:
-            # mypy会抱怨self._cos_client可能为None，但我们在调用前已经检查过了
-            metadata = await asyncio.to_thread(
-                self._cos_client.head_object,  # type: ignore[union-attr]
-                Bucket=self._settings.tencent_oss.bucket,
-                Key=cos_key,
-            )
-
-            # 安全地获取文件大小
-            content_length = metadata.get("Content-Length", "0")
-            try:
-                file_size = int(content_length) if content_length else 0
-            except (ValueError, TypeError):
-                raise HTTPException(
-                    status_code=502, detail="COS返回的文件大小格式无效"
-                ) from None
+            file_size = int(content_length) if content_length else 0
+        except (ValueError, TypeError):
+            raise HTTPException(
+                status_code=502, detail="COS返回的文件大小格式无效"
+            ) from None
 
-            category = metadata.get("x-cos-meta-category")
-            tags_str = metadata.get("x-cos-meta-tags")
-            tag_list = (
-                [tag.strip() for tag in tags_str.split(",")] if tags_str else []
-            )
+        category = metadata.get("x-cos-meta-category")
+        tag_list = _parse_tags(metadata.get("x-cos-meta-tags"))
 
-            return file_size, category, tag_list
-
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"获取COS对象元数据失败: {e}", exc_info=True)
-            raise HTTPException(
-                status_code=500,
-                detail=f"获取COS对象元数据失败: {cos_key}",
-            ) from e
+        return file_size, category, tag_list
 
     async def _download_cos_file(
-        self, cos_key: str, file_path: Path, temp_dir: Path
-    ) -> None:
+        self, cos_key: str, file_path: Path
+    ) -> tuple[int, str | None, list[str]]:
         """
-        从COS下载文件到本地路径
+        从COS流式下载文件到本地路径，并返回对象元数据
 
         Args:
             cos_key: COS对象键
             file_path: 本地文件路径
-            temp_dir: 临时目录（出错时用于清理）
+
+        Returns:
+            tuple[file_size, category, tag_list]: 文件大小、类别和标签列表
         """
         try:
-            await asyncio.to_thread(
-                self._cos_client.download_file,  # type: ignore[union-attr]
-                Bucket=self._settings.tencent_oss.bucket,
-                Key=cos_key,
-                DestFilePath=str(file_path),
+            return await asyncio.to_thread(
+                self._stream_cos_object, cos_key, file_path
             )
+        except HTTPException:
+            raise
         except Exception as e:
-            shutil.rmtree(temp_dir)
             logger.error(f"从COS下载文件失败: {e}", exc_info=True)
             raise HTTPException(
                 status_code=500, detail=f"从COS下载文件失败：{cos_key}"
             ) from e
 
+    def _stream_cos_object(
+        self, cos_key: str, file_path: Path
+    ) -> tuple[int, str | None, list[str]]:
+        """
+        一次 get_object 请求同时取得元数据与文件内容，省去单独的 head_object 往返。
+        响应头中的大小超限时不读取内容；边下载边写盘并校验大小，超限时立即中止。
+        """
+        # mypy会抱怨self._cos_client可能为None，但我们在调用前已经检查过了
+        response = self._cos_client.get_object(  # type: ignore[union-attr]
+            Bucket=self._settings.tencent_oss.bucket,
+            Key=cos_key,
+        )
+        body = response["Body"]
+        try:
+            file_size, category, tag_list = self._parse_cos_object_metadata(
+                response
+            )
+            if file_size > self._max_file_size_bytes:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"文件过大，最大支持{self._max_file_size_bytes // 1024 // 1024}MB",
+                )
+
+            total = self._write_chunks(
+                body.get_stream(_STREAM_CHUNK_SIZE), file_path
+            )
+        finally:
+            # 提前中止（如 413）时响应体未读完，需关闭底层流释放连接
+            body.get_raw_stream().close()
+
+        # 如果无法从COS获取文件大小，使用实际下载的大小
+        if file_size == 0:
+            file_size = total
+            logger.info(f"从下载数据获取实际大小: {file_size} 字节")
+        return file_size, category, tag_list
+
     async def upload_from_url(
-        self, request: UrlUploadRequest, background_tasks: BackgroundTasks
+        self, request: UrlUploadRequest
     ) -> UrlUploadResponse:
         """从腾讯云COS URL下载文件，然后创建并索引文档。"""
         # 0. 检查COS客户端是否可用
@@ -379,45 +591,25 @@ class DocumentHandler:
         # 1. 验证并解析URL
         cos_key, filename = self._validate_and_parse_cos_url(str(request.url))
 
-        # 2. 获取COS对象元数据
-        file_size, category, tag_list = await self._get_cos_object_metadata(
-            cos_key
-        )
-
-        # 3. 准备临时目录和文件路径
-        task_id = str(uuid.uuid4())
-        temp_dir = self._storage_path / task_id
-        temp_dir.mkdir(parents=True, exist_ok=True)
-        file_path = temp_dir / filename
-
-        # 4. 下载文件
-        await self._download_cos_file(cos_key, file_path, temp_dir)
+        # 2. 准备临时目录，后续步骤失败时自动清理
+        async with self._temp_upload_dir() as temp_dir:
+            file_path = temp_dir / filename
 
-        # 5. 如果无法从COS获取文件大小（权限不足），从本地文件获取
-        if file_size == 0:
-            file_size = file_path.stat().st_size
-            logger.info(f"从本地文件获取实际大小: {file_size} 字节")
-
-        # 6. 验证文件大小
-        if file_size > self._max_file_size_bytes:
-            shutil.rmtree(temp_dir)  # 清理已下载的文件
-            raise HTTPException(
-                status_code=413,
-                detail=f"文件过大，最大支持{self._max_file_size_bytes // 1024 // 1024}MB",
+            # 3. 下载文件并获取COS对象元数据，下载过程中校验文件大小
+            file_size, category, tag_list = await self._download_cos_file(
+                cos_key, file_path
             )
 
-        # 7. 创建Document并添加后台任务
-        document = Document(
-            index_prefix=request.index_prefix,
-            path=str(file_path.resolve()),
-            size=file_size,
-            category=category,
-            tags=tag_list,
-        )
-        background_tasks.add_task(
-            self._process_and_cleanup, task_id, temp_dir, document
-        )
-        return UrlUploadResponse(task_id=task_id, message="ok")
+            # 4. 创建Document并添加后台任务
+            document = Document(
+                index_prefix=request.index_prefix,
+                path=str(file_path),
+                size=file_size,
+                category=category,
+                tags=tag_list,
+            )
+            self._submit_index_task(temp_dir.name, temp_dir, document)
+        return UrlUploadResponse(task_id=temp_dir.name, message="ok")
 
     async def search(self, request: SearchRequest) -> SearchResponse:
         """文档搜索接口"""
@@ -426,8 +618,11 @@ class DocumentHandler:
                 f"🔍 收到搜索请求: type='{request.type}', query='{request.query}', top_k={request.top_k}"
             )
 
-            domain_response = self._service.search(
-                SearchConverter.request_vo_to_domain(request)
+            # 服务层为同步阻塞调用（ES 网络请求 + 嵌入/重排计算），
+            # 放到线程池执行，避免阻塞事件循环导致并发请求串行化
+            domain_response = await asyncio.to_thread(
+                self._service.search,
+                SearchConverter.request_vo_to_domain(request),
             )
 
             resp = SearchConverter.result_domain_to_vo(
@@ -445,13 +640,48 @@ class DocumentHandler:
             logger.error(f"❌ 搜索失败: {e}", exc_info=True)
             raise HTTPException(status_code=500, detail="搜索处理失败") from e
 
+    async def search_batch(
+        self, request: BatchSearchRequest
+    ) -> BatchSearchResponse:
+        """批量文档搜索接口"""
+        try:
+            logger.info(f"🔍 收到批量搜索请求: 共{len(request.requests)}个查询")
+
+            domain_responses = await asyncio.to_thread(
+                self._service.search_batch,
+                [
+                    SearchConverter.request_vo_to_domain(req)
+                    for req in request.requests
+                ],
+            )
+
+            resp = BatchSearchResponse(
+                responses=[
+                    SearchConverter.result_domain_to_vo(
+                        domain_response, req.type
+                    )
+                    for domain_response, req in zip(
+                        domain_responses, request.requests, strict=True
+                    )
+                ]
+            )
+            logger.info(f"✅ 批量搜索完成, 共{len(resp.responses)}个查询")
+            return resp
+        except NotFoundError as e:
+            raise HTTPException(status_code=404, detail=e.message) from e
+        except Exception as e:
+            logger.error(f"❌ 批量搜索失败: {e}", exc_info=True)
+            raise HTTPException(status_code=500, detail="搜索处理失败") from e
+
     async def es_search(self, request: ESSearchRequest) -> dict[str, Any]:
         """通过ES语法搜索文档接口"""
         try:
             logger.info(
                 f"🔍 收到ES搜索请求: index='{request.index}', query='{request.query}'"
             )
-            return self._service.es_search(request.index, request.query)
+            return await asyncio.to_thread(
+                self._service.es_search, request.index, request.query
+            )
         except NotFoundError as e:
             raise HTTPException(
                 status_code=404, detail=f"索引 {request.index} 不存在"
@@ -463,7 +693,8 @@ class DocumentHandler:
     async def save(self, request: SaveRequest) -> SaveResponse:
         """保存JSON格式文档到指定的Elasticsearch索引"""
         try:
-            self._service.save_for_structured_search(
+            await asyncio.to_thread(
+                self._service.save_for_structured_search,
                 index_name=request.index,
                 doc_id=request.key,
                 doc_dict=request.doc_json,
@@ -15,9 +15,10 @@
 """Web层VO模型定义"""
 
 from enum import Enum
-from typing import Any
+from typing import Annotated, Any, Literal
 
-from pydantic import BaseModel, Field, HttpUrl, Json, field_validator
+import orjson
+from pydantic import BaseModel, Field, HttpUrl, field_validator
 from pydantic_core.core_schema import ValidationInfo
 
 from app.config.settings import settings
@@ -130,6 +131,17 @@ class SearchRequest(BaseModel):
         return v
 
 
+class BatchSearchRequest(BaseModel):
+    """批量搜索请求"""
+
+    requests: list[SearchRequest] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.search.max_batch_size,
+        description="搜索请求列表 1 <= 数量 <= 配置文件中的max_batch_size",
+    )
+
+
 class ESSearchRequest(BaseModel):
     index: str = Field(..., min_length=1, description="ES索引名称")
     query: dict[str, Any] = Field(..., description="符合ES语法规范的查询语句")
@@ -138,6 +150,7 @@ class ESSearchRequest(BaseModel):
 class VectorHybridSearchResult(BaseModel):
     """向量+全文混合搜索结果"""
 
+    kind: Literal["hybrid"] = Field("hybrid", description="结果类型标识")
     text: str = Field(..., description="文档内容")
     file_metadata_id: str = Field(..., description="文件元数据ID")
     score: float = Field(..., description="相关度分数")
@@ -146,6 +159,9 @@ class VectorHybridSearchResult(BaseModel):
 class StructuredSearchResult(BaseModel):
     """结构化搜索结果"""
 
+    kind: Literal["structured"] = Field(
+        "structured", description="结果类型标识"
+    )
     id: str = Field(..., description="文档唯一标识符")
     document: dict[str, Any] = Field(..., description="文档数据")
     score: float = Field(..., description="相关度分数")
@@ -154,8 +170,20 @@ class StructuredSearchResult(BaseModel):
 class SearchResponse(BaseModel):
     """搜索响应"""
 
-    results: list[VectorHybridSearchResult | StructuredSearchResult] = Field(
-        default_factory=list, description="搜索结果"
+    # 按 kind 字段直接分派到对应模型校验，无需逐个尝试联合类型的各个成员
+    results: list[
+        Annotated[
+            VectorHybridSearchResult | StructuredSearchResult,
+            Field(discriminator="kind"),
+        ]
+    ] = Field(default_factory=list, description="搜索结果")
+
+
+class BatchSearchResponse(BaseModel):
+    """批量搜索响应"""
+
+    responses: list[SearchResponse] = Field(
+        default_factory=list, description="与请求顺序一一对应的搜索响应"
     )
 
 
@@ -169,15 +197,27 @@ class SaveRequest(BaseModel):
     Attributes:
         index: ES中索引的完整名称，假定mappings已建立好
         key: 文档的唯一标识，将作为ES中的_id使用
-        doc_json: 满足JSON格式的字符串文档内容，会自动解析为字典
+        doc_json: 文档内容，可直接传JSON对象；为兼容旧调用方，
+            也接受JSON格式的字符串并自动解析为字典
     """
 
     index: str = Field(..., min_length=1, description="ES索引名称")
     key: str = Field(..., min_length=1, description="文档唯一标识")
-    doc_json: Json[dict[str, Any]] = Field(
-        ..., description="JSON格式的文档内容"
+    doc_json: dict[str, Any] = Field(
+        ..., description="JSON对象或JSON格式字符串表示的文档内容"
     )
 
+    @field_validator("doc_json", mode="before")
+    @classmethod
+    def parse_json_string(cls, v: Any) -> Any:  # noqa: ANN401
+        """字符串形式的文档内容需要额外解析一次，对象形式直接使用"""
+        if isinstance(v, str | bytes):
+            try:
+                return orjson.loads(v)
+            except orjson.JSONDecodeError as e:
+                raise ValueError(f"doc_json 不是合法的JSON: {e}") from e
+        return v
+
 
 class SaveResponse(BaseModel):
     """文档保存操作的响应模型"""
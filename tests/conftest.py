@@ -17,6 +17,7 @@ API 测试配置和共享fixtures
 """
 
 import logging
+import time
 from collections.abc import Callable, Generator
 from pathlib import Path
 from typing import Any, overload
@@ -48,7 +49,7 @@ def cos_client() -> CosS3Client:
     return client
 
 
-@pytest.fixture(scope="class")
+@pytest.fixture(scope="session")
 def user_upload_dir() -> Path:
     """提供 '用户准备上传' 的文件目录路径。"""
     path = Path(__file__).parent / "fixtures" / "files" / "user"
@@ -56,7 +57,7 @@ def user_upload_dir() -> Path:
     return path
 
 
-@pytest.fixture(scope="class")
+@pytest.fixture(scope="session")
 def get_user_upload_file(
     user_upload_dir: Path,
 ) -> Callable[[str | list[str]], Path | list[Path]]:
@@ -83,13 +84,40 @@ def get_user_upload_file(
     return _builder  # type: ignore[return-value]
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def client() -> Generator[TestClient, Any]:
-    """V2 API 测试客户端"""
+    """V2 API 测试客户端，整个测试会话共享，应用只启动和关闭一次"""
     with TestClient(app) as test_client:
         yield test_client
 
 
+@pytest.fixture(scope="session")
+def wait_for_task(client: TestClient) -> Callable[..., None]:
+    """
+    通过任务状态接口的长轮询（wait 参数）等待后台索引任务完成，
+    服务端在任务结束时立即返回，无需客户端定时轮询。
+    """
+
+    def _wait(task_id: str, timeout: float = 30.0) -> None:
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            status = client.get(
+                f"/api/v1/tasks/{task_id}",
+                params={"wait": max(min(remaining, 60.0), 0)},
+            ).json()["status"]
+            if status == "completed":
+                return
+            if status.startswith("failed"):
+                pytest.fail(f"任务处理失败: {status}")
+            if status == "not_found":
+                pytest.fail(f"任务不存在: {task_id}")
+            if time.monotonic() >= deadline:
+                pytest.fail(f"任务处理超时: {task_id}, 最后状态: {status}")
+
+    return _wait
+
+
 @pytest.fixture(scope="session")
 def es_client() -> Generator[Elasticsearch, Any]:
     """
@@ -101,6 +129,10 @@ def es_client() -> Generator[Elasticsearch, Any]:
         retry_on_timeout=True,
         # 如果有认证信息也要添加
     )
+    # 快速预检：ES 不可达时直接跳过依赖它的测试，避免每个用例都超时重试
+    if not client.options(request_timeout=1, max_retries=0).ping():
+        client.close()
+        pytest.skip("Elasticsearch服务不可用，跳过依赖ES的测试")
     # 测试连接
     try:
         info = client.info()
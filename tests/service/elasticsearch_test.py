@@ -0,0 +1,224 @@
+# Copyright 2021 ecodeclub
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http:#www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+from langchain_core.documents import Document as LangChainDocument
+from numpy.typing import NDArray
+
+from app.config.settings import settings
+from app.domain.document import Document
+from app.domain.search import (
+    DocumentResult,
+    SearchCondition,
+    SearchMode,
+    SearchParameters,
+)
+from app.service.elasticsearch import ElasticsearchService
+from app.utils.rerankers.cosine import CosineReranker
+
+
+class _CountingEmbedder:
+    """记录调用次数的嵌入模型替身"""
+
+    dimensions = 3
+    similarity_metric = "cosine"
+
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+
+    def embed_documents(self, texts: list[str]) -> NDArray[np.float32]:
+        self.calls.append(list(texts))
+        return np.ones((len(texts), self.dimensions), dtype=np.float32)
+
+
+class _KnownVectorEmbedder:
+    """按预设映射返回向量的嵌入模型替身"""
+
+    dimensions = 3
+    similarity_metric = "cosine"
+
+    def __init__(self, vectors: dict[str, list[float]]) -> None:
+        self._vectors = vectors
+        self.calls: list[list[str]] = []
+
+    def embed_documents(self, texts: list[str]) -> NDArray[np.float32]:
+        self.calls.append(list(texts))
+        return np.asarray([self._vectors[t] for t in texts], dtype=np.float32)
+
+
+class _PassthroughReranker:
+    """不改变顺序的重排器替身"""
+
+    @staticmethod
+    def rerank(
+        query: str, results: list[DocumentResult]
+    ) -> list[DocumentResult]:
+        return results
+
+
+def _hybrid_parameters(text: str) -> SearchParameters:
+    return SearchParameters(
+        index_name="test_chunks",
+        conditions=[
+            SearchCondition("content", SearchMode.VECTOR, text),
+            SearchCondition("content", SearchMode.MATCH, text),
+        ],
+        limit=3,
+    )
+
+
+class TestQueryEmbeddingCache:
+    """单条混合搜索的查询向量缓存测试"""
+
+    def test_identical_queries_embed_once(self) -> None:
+        """相同查询文本只推理一次，且缓存的向量为只读"""
+        embedder = _CountingEmbedder()
+        client = MagicMock()
+        client.search.return_value.body = {"hits": {"total": {"value": 0}}}
+        service = ElasticsearchService(
+            client=client,
+            loader=MagicMock(),
+            splitter=MagicMock(),
+            embedder=embedder,
+            reranker=_PassthroughReranker(),
+            settings=settings,
+        )
+
+        service.search(_hybrid_parameters("缓存"))
+        service.search(_hybrid_parameters("缓存"))
+
+        assert embedder.calls == [["缓存"]]
+        assert client.search.call_count == 2
+        query_vector = client.search.call_args.kwargs["body"]["knn"][
+            "query_vector"
+        ]
+        assert not query_vector.flags.writeable
+
+
+class TestCosineRerank:
+    """余弦重排使用存储块向量的测试"""
+
+    def test_scores_against_stored_vectors(self) -> None:
+        """只推理查询向量，按存储的块向量重排，且向量不出现在返回内容中"""
+        embedder = _KnownVectorEmbedder({"查询": [1.0, 0.0, 0.0]})
+        client = MagicMock()
+        client.search.return_value.body = {
+            "hits": {
+                "total": {"value": 3},
+                "hits": [
+                    {
+                        "_id": "far",
+                        "_score": 3.0,
+                        "_source": {
+                            "content": "无关",
+                            "file_metadata_id": "m",
+                            "content_vector": [0.0, 1.0, 0.0],
+                        },
+                    },
+                    {
+                        "_id": "near",
+                        "_score": 1.0,
+                        "_source": {
+                            "content": "相近",
+                            "file_metadata_id": "m",
+                            "content_vector": [0.9, 0.1, 0.0],
+                        },
+                    },
+                    {
+                        "_id": "middle",
+                        "_score": 2.0,
+                        "_source": {
+                            "content": "部分相关",
+                            "file_metadata_id": "m",
+                            "content_vector": [0.5, 0.5, 0.0],
+                        },
+                    },
+                ],
+            }
+        }
+        cosine_settings = settings.model_copy(
+            update={
+                "reranker": settings.reranker.model_copy(
+                    update={"backend": "cosine"}
+                )
+            }
+        )
+        service = ElasticsearchService(
+            client=client,
+            loader=MagicMock(),
+            splitter=MagicMock(),
+            embedder=embedder,
+            reranker=CosineReranker(
+                embed_query=lambda query: service.embed_query(query)
+            ),
+            settings=cosine_settings,
+        )
+
+        result = service.search(_hybrid_parameters("查询"))
+
+        assert embedder.calls == [["查询"]]
+        assert (
+            "content_vector"
+            in client.search.call_args.kwargs["body"]["_source"]
+        )
+        assert [doc.content["content"] for doc in result.documents] == [
+            "相近",
+            "部分相关",
+            "无关",
+        ]
+        assert all(
+            "content_vector" not in doc.content for doc in result.documents
+        )
+
+
+class TestChunkRollback:
+    """文档块写入失败时的回滚测试"""
+
+    def test_bulk_exception_deletes_chunks_by_metadata_id(self) -> None:
+        """parallel_bulk 中途抛出异常时，按 file_metadata_id 删除已写入的块"""
+        client = MagicMock()
+        splitter = MagicMock()
+        splitter.split_documents.return_value = [
+            LangChainDocument(page_content="第一块"),
+            LangChainDocument(page_content="第二块"),
+        ]
+        service = ElasticsearchService(
+            client=client,
+            loader=MagicMock(),
+            splitter=splitter,
+            embedder=_CountingEmbedder(),
+            reranker=_PassthroughReranker(),
+            settings=settings,
+        )
+        document = Document(
+            index_prefix="test", path="a.txt", size=1, id="meta-1"
+        )
+
+        def failing_bulk(**_: object) -> object:
+            yield True, {"index": {"_id": "auto-1"}}
+            raise ConnectionError("bulk 中断")
+
+        with (
+            patch("app.service.elasticsearch.parallel_bulk", failing_bulk),
+            pytest.raises(ConnectionError),
+        ):
+            service._create_chunks("test_chunks", document)
+
+        client.delete_by_query.assert_called_once()
+        assert client.delete_by_query.call_args.kwargs["query"] == {
+            "term": {"file_metadata_id": "meta-1"}
+        }
@@ -0,0 +1,169 @@
+# Copyright 2021 ecodeclub
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http:#www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections.abc import Generator
+from typing import Any
+
+import pytest
+from elasticsearch import Elasticsearch, helpers
+from fastapi.testclient import TestClient
+
+from app.config.settings import settings
+
+
+@pytest.mark.xdist_group("batch_search_index")
+class TestBatchSearch:
+    """批量搜索测试"""
+
+    TEST_INDEX = "test_search_batch"
+
+    @pytest.fixture(scope="class", autouse=True)
+    def setup_environment(
+        self, es_client: Elasticsearch
+    ) -> Generator[None, Any]:
+        """准备测试环境（索引+数据）"""
+        es_client.indices.delete(index=self.TEST_INDEX, ignore_unavailable=True)
+
+        es_client.indices.create(
+            index=self.TEST_INDEX,
+            body={
+                # 数据只经 bulk(refresh=True) 一次写入：关闭副本与周期刷新
+                "settings": {"number_of_replicas": 0, "refresh_interval": "-1"},
+                "mappings": {
+                    "properties": {
+                        "role": {"type": "keyword"},
+                        "level": {"type": "keyword"},
+                        "content": {"type": "text"},
+                    }
+                },
+            },
+        )
+
+        test_documents = [
+            {
+                "id": "backend_senior_1",
+                "data": {
+                    "role": "后端",
+                    "level": "高级",
+                    "content": "MySQL设计及性能优化",
+                },
+            },
+            {
+                "id": "backend_junior_1",
+                "data": {
+                    "role": "后端",
+                    "level": "初级",
+                    "content": "Python 基础语法学习",
+                },
+            },
+            {
+                "id": "frontend_senior_1",
+                "data": {
+                    "role": "前端",
+                    "level": "高级",
+                    "content": "React 组件设计模式",
+                },
+            },
+        ]
+        helpers.bulk(
+            es_client,
+            (
+                {
+                    "_op_type": "index",
+                    "_index": self.TEST_INDEX,
+                    "_id": doc["id"],
+                    "_source": doc["data"],
+                }
+                for doc in test_documents
+            ),
+            refresh=True,
+        )
+
+        yield
+
+        es_client.indices.delete(index=self.TEST_INDEX, ignore_unavailable=True)
+
+    def _term_request(self, field: str, value: str) -> dict[str, Any]:
+        return {
+            "type": "structured",
+            "query": {
+                "index": self.TEST_INDEX,
+                "conditions": [{"field": field, "op": "term", "value": value}],
+            },
+            "top_k": 5,
+        }
+
+    def test_batch_results_follow_request_order(
+        self, client: TestClient
+    ) -> None:
+        """测试批量搜索结果与请求一一对应"""
+        response = client.post(
+            "/api/v1/search/batch",
+            json={
+                "requests": [
+                    self._term_request("role", "后端"),
+                    self._term_request("role", "前端"),
+                    self._term_request("level", "中级"),
+                ]
+            },
+        )
+
+        assert response.status_code == 200
+        responses = response.json()["responses"]
+        assert len(responses) == 3
+
+        assert {r["id"] for r in responses[0]["results"]} == {
+            "backend_senior_1",
+            "backend_junior_1",
+        }
+        assert {r["id"] for r in responses[1]["results"]} == {
+            "frontend_senior_1"
+        }
+        # 无命中的查询同样返回对应位置的空结果
+        assert responses[2]["results"] == []
+
+    def test_batch_with_nonexistent_index(self, client: TestClient) -> None:
+        """测试批量搜索中包含不存在的索引"""
+        bad_request = self._term_request("role", "后端")
+        bad_request["query"]["index"] = "nonexistent_batch_index"
+
+        response = client.post(
+            "/api/v1/search/batch",
+            json={
+                "requests": [self._term_request("role", "后端"), bad_request]
+            },
+        )
+
+        assert response.status_code == 404
+        assert "nonexistent_batch_index" in response.json()["detail"]
+
+    @pytest.mark.parametrize(
+        "count",
+        [0, settings.search.max_batch_size + 1],
+        ids=["empty", "too_many"],
+    )
+    def test_batch_size_validation(
+        self, client: TestClient, count: int
+    ) -> None:
+        """测试批量搜索的请求数量限制"""
+        response = client.post(
+            "/api/v1/search/batch",
+            json={
+                "requests": [
+                    self._term_request("role", "后端") for _ in range(count)
+                ]
+            },
+        )
+
+        assert response.status_code == 422
@@ -11,14 +11,16 @@
 # limitations under the License.
 
 
-from collections.abc import Generator
+import os
+from collections.abc import Callable, Generator
 from typing import Any
 
 import pytest
-from elasticsearch import Elasticsearch
+from elasticsearch import Elasticsearch, helpers
 from fastapi.testclient import TestClient
 
 
+@pytest.mark.xdist_group("es_search_index")
 class TestESSearch:
     """ES代理转发API测试
 
@@ -28,7 +30,10 @@ class TestESSearch:
     3. 错误处理
     """
 
-    TEST_INDEX = "test_es_search_proxy"
+    # pytest-xdist 下每个 worker 使用独立索引，避免并行时互相删除/覆盖数据
+    TEST_INDEX = (
+        f"test_es_search_proxy_{os.environ.get('PYTEST_XDIST_WORKER', 'main')}"
+    )
 
     @pytest.fixture(scope="class", autouse=True)
     def setup_environment(
@@ -37,13 +42,14 @@ class TestESSearch:
         """准备测试环境（索引+数据）"""
 
         # 1. 清理已存在的索引
-        if es_client.indices.exists(index=self.TEST_INDEX):
-            es_client.indices.delete(index=self.TEST_INDEX)
+        es_client.indices.delete(index=self.TEST_INDEX, ignore_unavailable=True)
 
         # 2. 创建测试索引
         es_client.indices.create(
             index=self.TEST_INDEX,
             body={
+                # 数据只经 bulk(refresh=True) 一次写入：关闭副本与周期刷新
+                "settings": {"number_of_replicas": 0, "refresh_interval": "-1"},
                 "mappings": {
                     "properties": {
                         "role": {"type": "keyword"},
@@ -54,7 +60,7 @@ class TestESSearch:
                         "salary": {"type": "integer"},
                         "age": {"type": "integer"},
                     }
-                }
+                },
             },
         )
 
@@ -65,8 +71,7 @@ class TestESSearch:
         yield
 
         # 5. 清理测试索引
-        if es_client.indices.exists(index=self.TEST_INDEX):
-            es_client.indices.delete(index=self.TEST_INDEX)
+        es_client.indices.delete(index=self.TEST_INDEX, ignore_unavailable=True)
 
     def _prepare_test_data(self, es_client: Elasticsearch) -> None:
         """准备测试数据"""
@@ -118,12 +123,20 @@ class TestESSearch:
             },
         ]
 
-        # 批量插入
-        for i, doc in enumerate(test_documents):
-            es_client.index(index=self.TEST_INDEX, id=f"doc_{i + 1}", body=doc)
-
-        # 刷新索引确保数据可搜索
-        es_client.indices.refresh(index=self.TEST_INDEX)
+        # 批量插入：一次 bulk 请求写入全部文档，并立即刷新确保数据可搜索
+        helpers.bulk(
+            es_client,
+            (
+                {
+                    "_op_type": "index",
+                    "_index": self.TEST_INDEX,
+                    "_id": f"doc_{i + 1}",
+                    "_source": doc,
+                }
+                for i, doc in enumerate(test_documents)
+            ),
+            refresh=True,
+        )
 
     # ===== 基础查询测试 =====
 
@@ -151,25 +164,72 @@ class TestESSearch:
         # 验证返回所有文档
         assert data["hits"]["total"]["value"] == 5
 
-    def test_term_query(self, client: TestClient) -> None:
-        """测试 term 精确匹配查询"""
+    @pytest.mark.parametrize(
+        ("query", "expected_total", "check_source"),
+        [
+            pytest.param(
+                {"term": {"role": "后端"}},
+                3,
+                lambda src: src["role"] == "后端",
+                id="term",
+            ),
+            pytest.param(
+                {
+                    "bool": {
+                        "must": [
+                            {"term": {"role": "后端"}},
+                            {"term": {"level": "高级"}},
+                        ]
+                    }
+                },
+                2,
+                lambda src: src["role"] == "后端" and src["level"] == "高级",
+                id="bool_must",
+            ),
+            pytest.param(
+                {
+                    "bool": {
+                        "should": [
+                            {"term": {"role": "前端"}},
+                            {"term": {"role": "测试"}},
+                        ],
+                        "minimum_should_match": 1,
+                    }
+                },
+                2,
+                lambda src: src["role"] in ["前端", "测试"],
+                id="bool_should",
+            ),
+            pytest.param(
+                {"range": {"salary": {"gte": 20000, "lte": 30000}}},
+                3,
+                lambda src: 20000 <= src["salary"] <= 30000,
+                id="range",
+            ),
+        ],
+    )
+    def test_exact_match_queries(
+        self,
+        client: TestClient,
+        query: dict[str, Any],
+        expected_total: int,
+        check_source: Callable[[dict[str, Any]], bool],
+    ) -> None:
+        """测试 term / bool must / bool should / range 等精确条件查询
+
+        命中数量固定，且每条结果都必须满足查询条件
+        """
         response = client.post(
             "/api/v1/es_search",
-            json={
-                "index": self.TEST_INDEX,
-                "query": {"query": {"term": {"role": "后端"}}},
-            },
+            json={"index": self.TEST_INDEX, "query": {"query": query}},
         )
 
         assert response.status_code == 200
         data = response.json()
 
-        # 验证结果
-        assert data["hits"]["total"]["value"] == 3
-
-        # 验证所有结果都是后端
+        assert data["hits"]["total"]["value"] == expected_total
         for hit in data["hits"]["hits"]:
-            assert hit["_source"]["role"] == "后端"
+            assert check_source(hit["_source"]), hit["_source"]
 
     def test_match_query(self, client: TestClient) -> None:
         """测试 match 全文搜索"""
@@ -191,66 +251,6 @@ class TestESSearch:
         for hit in data["hits"]["hits"]:
             assert "设计" in hit["_source"]["content"]
 
-    def test_bool_must_query(self, client: TestClient) -> None:
-        """测试 bool must 组合查询（AND逻辑）"""
-        response = client.post(
-            "/api/v1/es_search",
-            json={
-                "index": self.TEST_INDEX,
-                "query": {
-                    "query": {
-                        "bool": {
-                            "must": [
-                                {"term": {"role": "后端"}},
-                                {"term": {"level": "高级"}},
-                            ]
-                        }
-                    }
-                },
-            },
-        )
-
-        assert response.status_code == 200
-        data = response.json()
-
-        # 验证结果数量
-        assert data["hits"]["total"]["value"] == 2
-
-        # 验证所有结果都满足条件
-        for hit in data["hits"]["hits"]:
-            assert hit["_source"]["role"] == "后端"
-            assert hit["_source"]["level"] == "高级"
-
-    def test_bool_should_query(self, client: TestClient) -> None:
-        """测试 bool should 组合查询（OR逻辑）"""
-        response = client.post(
-            "/api/v1/es_search",
-            json={
-                "index": self.TEST_INDEX,
-                "query": {
-                    "query": {
-                        "bool": {
-                            "should": [
-                                {"term": {"role": "前端"}},
-                                {"term": {"role": "测试"}},
-                            ],
-                            "minimum_should_match": 1,
-                        }
-                    }
-                },
-            },
-        )
-
-        assert response.status_code == 200
-        data = response.json()
-
-        # 验证结果数量
-        assert data["hits"]["total"]["value"] == 2
-
-        # 验证所有结果都是前端或测试
-        for hit in data["hits"]["hits"]:
-            assert hit["_source"]["role"] in ["前端", "测试"]
-
     def test_bool_filter_query(self, client: TestClient) -> None:
         """测试 bool filter 查询（不影响评分）"""
         response = client.post(
@@ -276,27 +276,6 @@ class TestESSearch:
             assert hit["_source"]["status"] == "active"
             assert "设计" in hit["_source"]["content"]
 
-    def test_range_query(self, client: TestClient) -> None:
-        """测试 range 范围查询"""
-        response = client.post(
-            "/api/v1/es_search",
-            json={
-                "index": self.TEST_INDEX,
-                "query": {
-                    "query": {"range": {"salary": {"gte": 20000, "lte": 30000}}}
-                },
-            },
-        )
-
-        assert response.status_code == 200
-        data = response.json()
-
-        # 验证所有结果的薪资都在范围内
-        assert data["hits"]["total"]["value"] == 3
-        for hit in data["hits"]["hits"]:
-            salary = hit["_source"]["salary"]
-            assert 20000 <= salary <= 30000
-
     # ===== 高级功能测试 =====
 
     def test_query_with_size(self, client: TestClient) -> None:
@@ -12,20 +12,26 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import json
+import logging
 from collections.abc import Generator
 from typing import Any, cast
 
+import orjson
 import pytest
 from elasticsearch import Elasticsearch
 from elasticsearch.exceptions import NotFoundError, TransportError
 from fastapi.testclient import TestClient
 
+logger = logging.getLogger(__name__)
 
+
+@pytest.mark.xdist_group("save_index")
 class TestSaveEndpoint:
     """测试文档保存接口"""
 
     TEST_INDEX = "test_save_index"
+    # 字段校验用例共用的合法 doc_json
+    VALID_DOC_JSON = '{"role": "后端", "level": "高级", "content": "测试内容"}'
 
     @pytest.fixture(scope="class", autouse=True)
     def setup_test_index(
@@ -33,13 +39,14 @@ class TestSaveEndpoint:
     ) -> Generator[None, Any]:
         """设置测试索引"""
         # 如果索引存在则删除（清理之前的测试）
-        if es_client.indices.exists(index=self.TEST_INDEX):
-            es_client.indices.delete(index=self.TEST_INDEX)
+        es_client.indices.delete(index=self.TEST_INDEX, ignore_unavailable=True)
 
         # 创建测试索引
         es_client.indices.create(
             index=self.TEST_INDEX,
             body={
+                # 单节点测试集群无需副本；保存接口依赖 refresh="wait_for"，保留周期刷新
+                "settings": {"number_of_replicas": 0},
                 "mappings": {
                     "properties": {
                         "role": {
@@ -50,15 +57,14 @@ class TestSaveEndpoint:
                         },  # 精确匹配：初级、中级、高级等
                         "content": {"type": "text"},  # 模糊匹配：详细描述内容
                     }
-                }
+                },
             },
         )
 
         yield
 
         # 清理：删除测试索引
-        if es_client.indices.exists(index=self.TEST_INDEX):
-            es_client.indices.delete(index=self.TEST_INDEX)
+        es_client.indices.delete(index=self.TEST_INDEX, ignore_unavailable=True)
 
     def _get_document_from_es(
         self, es_client: Elasticsearch, doc_id: str
@@ -69,26 +75,17 @@ class TestSaveEndpoint:
             return cast("dict[str, Any]", response["_source"])
         except NotFoundError:
             return None
-        except TransportError as e:
-            print(
-                f"ES获取文档失败 - 索引: {self.TEST_INDEX}, 文档ID: {doc_id}, 错误: {e}"
+        except TransportError:
+            logger.exception(
+                "ES获取文档失败 - 索引: %s, 文档ID: %s", self.TEST_INDEX, doc_id
             )
             raise
 
     def _document_exists_in_es(
         self, es_client: Elasticsearch, doc_id: str
     ) -> bool:
-        """检查文档是否存在于ES中"""
-        try:
-            es_client.get(index=self.TEST_INDEX, id=doc_id)
-            return True
-        except NotFoundError:
-            return False
-        except TransportError as e:
-            print(
-                f"ES检查文档存在性失败 - 索引: {self.TEST_INDEX}, 文档ID: {doc_id}, 错误: {e}"
-            )
-            raise
+        """检查文档是否存在于ES中（HEAD 请求，不加载 _source）"""
+        return bool(es_client.exists(index=self.TEST_INDEX, id=doc_id))
 
     def test_save_new_document(
         self, client: TestClient, es_client: Elasticsearch
@@ -113,19 +110,16 @@ class TestSaveEndpoint:
             json={
                 "index": self.TEST_INDEX,
                 "key": doc_id,
-                "doc_json": json.dumps(doc_data),
+                "doc_json": orjson.dumps(doc_data).decode(),
             },
         )
         assert response.status_code == 200
         response_data = response.json()
         assert "ok" in response_data["message"]
 
-        # 验证文档已插入ES
-        assert self._document_exists_in_es(es_client, doc_id), (
-            "文档应该已经插入"
-        )
+        # 验证文档已插入ES（不存在时返回None，一次GET同时校验存在性与内容）
         saved_doc = self._get_document_from_es(es_client, doc_id)
-        assert saved_doc == doc_data
+        assert saved_doc == doc_data, "文档应该已经插入且内容匹配"
 
     def test_save_update_existing_document(
         self, client: TestClient, es_client: Elasticsearch
@@ -149,16 +143,10 @@ class TestSaveEndpoint:
             "文档不应该预先存在"
         )
 
-        # 先插入一个文档并验证原文档存在
-        es_client.index(
-            index=self.TEST_INDEX,
-            id=doc_id,
-            document=original_doc,
-            refresh="wait_for",
-        )
-        assert self._document_exists_in_es(es_client, doc_id), "原文档应该存在"
+        # 先插入一个文档并验证原文档存在（GET 按 id 实时读取，无需等待 refresh）
+        es_client.index(index=self.TEST_INDEX, id=doc_id, document=original_doc)
         original_saved = self._get_document_from_es(es_client, doc_id)
-        assert original_saved == original_doc
+        assert original_saved == original_doc, "原文档应该存在且内容匹配"
 
         # 调用保存接口进行覆盖
         response = client.post(
@@ -166,7 +154,7 @@ class TestSaveEndpoint:
             json={
                 "index": self.TEST_INDEX,
                 "key": doc_id,
-                "doc_json": json.dumps(updated_doc),
+                "doc_json": orjson.dumps(updated_doc).decode(),
             },
         )
 
@@ -177,7 +165,33 @@ class TestSaveEndpoint:
 
         # 验证文档已完全覆盖
         updated_saved = self._get_document_from_es(es_client, doc_id)
-        assert updated_saved == updated_doc
+        assert updated_saved == updated_doc, "文档应该已被完全覆盖"
+
+    def test_save_document_as_json_object(
+        self, client: TestClient, es_client: Elasticsearch
+    ) -> None:
+        """测试doc_json直接传JSON对象"""
+
+        doc_id = "tester_dev_1"
+        doc_data = {
+            "role": "测试",
+            "level": "初级",
+            "content": "负责接口自动化测试用例的编写与维护",
+        }
+
+        response = client.post(
+            "/api/v1/documents/save",
+            json={
+                "index": self.TEST_INDEX,
+                "key": doc_id,
+                "doc_json": doc_data,
+            },
+        )
+        assert response.status_code == 200
+        assert "ok" in response.json()["message"]
+
+        saved_doc = self._get_document_from_es(es_client, doc_id)
+        assert saved_doc == doc_data
 
     def test_save_invalid_json_format(self, client: TestClient) -> None:
         """测试无效的JSON格式"""
@@ -195,48 +209,52 @@ class TestSaveEndpoint:
         error_data = response.json()
         assert "detail" in error_data
 
-    def test_save_empty_fields(self, client: TestClient) -> None:
-        """测试空字段"""
-
-        test_cases = [
+    @pytest.mark.parametrize(
+        "payload",
+        [
             {
                 "index": "",
                 "key": "test",
-                "doc_json": '{"role": "后端", "level": "高级", "content": "测试内容"}',
-            },  # 空索引
+                "doc_json": VALID_DOC_JSON,
+            },
             {
-                "index": self.TEST_INDEX,
+                "index": TEST_INDEX,
                 "key": "",
-                "doc_json": '{"role": "后端", "level": "高级", "content": "测试内容"}',
-            },  # 空key
-        ]
-
-        for case in test_cases:
-            response = client.post("/api/v1/documents/save", json=case)
-            assert response.status_code == 422  # 字段验证错误
-            error_data = response.json()
-            assert "detail" in error_data
-
-    def test_save_missing_fields(self, client: TestClient) -> None:
-        """测试缺失字段"""
+                "doc_json": VALID_DOC_JSON,
+            },
+        ],
+        ids=["empty_index", "empty_key"],
+    )
+    def test_save_empty_fields(
+        self, client: TestClient, payload: dict[str, Any]
+    ) -> None:
+        """测试空字段"""
+        response = client.post("/api/v1/documents/save", json=payload)
+        assert response.status_code == 422  # 字段验证错误
+        assert "detail" in response.json()
 
-        test_cases = [
+    @pytest.mark.parametrize(
+        "payload",
+        [
             {
                 "key": "test",
-                "doc_json": '{"role": "后端", "level": "高级", "content": "测试内容"}',
-            },  # 缺失index
+                "doc_json": VALID_DOC_JSON,
+            },
             {
-                "index": self.TEST_INDEX,
-                "doc_json": '{"role": "后端", "level": "高级", "content": "测试内容"}',
-            },  # 缺失key
-            {"index": self.TEST_INDEX, "key": "test"},  # 缺失doc_json
-        ]
-
-        for case in test_cases:
-            response = client.post("/api/v1/documents/save", json=case)
-            assert response.status_code == 422  # 缺失字段错误
-            error_data = response.json()
-            assert "detail" in error_data
+                "index": TEST_INDEX,
+                "doc_json": VALID_DOC_JSON,
+            },
+            {"index": TEST_INDEX, "key": "test"},
+        ],
+        ids=["missing_index", "missing_key", "missing_doc_json"],
+    )
+    def test_save_missing_fields(
+        self, client: TestClient, payload: dict[str, Any]
+    ) -> None:
+        """测试缺失字段"""
+        response = client.post("/api/v1/documents/save", json=payload)
+        assert response.status_code == 422  # 缺失字段错误
+        assert "detail" in response.json()
 
     def test_save_invalid_index_name(self, client: TestClient) -> None:
         """测试无效索引名（模拟ES错误）"""
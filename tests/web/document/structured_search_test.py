@@ -10,15 +10,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import json
 from collections.abc import Generator
 from typing import Any
 
 import pytest
-from elasticsearch import Elasticsearch
+from elasticsearch import Elasticsearch, helpers
 from fastapi.testclient import TestClient
 
 
+@pytest.mark.xdist_group("structured_search_index")
 class TestStructuredSearch:
     """结构化搜索测试
 
@@ -31,18 +31,19 @@ class TestStructuredSearch:
 
     @pytest.fixture(scope="class", autouse=True)
     def setup_environment(
-        self, client: TestClient, es_client: Elasticsearch
+        self, es_client: Elasticsearch
     ) -> Generator[None, Any]:
         """准备测试环境（索引+数据）"""
 
         # 1. 清理已存在的索引
-        if es_client.indices.exists(index=self.TEST_INDEX):
-            es_client.indices.delete(index=self.TEST_INDEX)
+        es_client.indices.delete(index=self.TEST_INDEX, ignore_unavailable=True)
 
         # 2. 创建结构化搜索测试索引
         es_client.indices.create(
             index=self.TEST_INDEX,
             body={
+                # 数据只经 bulk(refresh=True) 一次写入：关闭副本与周期刷新
+                "settings": {"number_of_replicas": 0, "refresh_interval": "-1"},
                 "mappings": {
                     "properties": {
                         "role": {"type": "keyword"},  # 精确匹配
@@ -53,23 +54,20 @@ class TestStructuredSearch:
                         "tags": {"type": "keyword"},  # 精确匹配
                         "salary": {"type": "integer"},  # 数值类型
                     }
-                }
+                },
             },
         )
 
         # 3. 准备测试数据
-        self._prepare_test_data(client, es_client)
+        self._prepare_test_data(es_client)
 
         # 4. 执行所有测试
         yield
 
         # 5. 清理测试索引
-        if es_client.indices.exists(index=self.TEST_INDEX):
-            es_client.indices.delete(index=self.TEST_INDEX)
+        es_client.indices.delete(index=self.TEST_INDEX, ignore_unavailable=True)
 
-    def _prepare_test_data(
-        self, client: TestClient, es_client: Elasticsearch
-    ) -> None:
+    def _prepare_test_data(self, es_client: Elasticsearch) -> None:
         """准备结构化搜索测试数据（在fixture中调用，只执行一次）"""
 
         test_documents = [
@@ -135,22 +133,20 @@ class TestStructuredSearch:
             },
         ]
 
-        # 使用save接口插入所有测试数据
-        for doc in test_documents:
-            response = client.post(
-                "/api/v1/documents/save",
-                json={
-                    "index": self.TEST_INDEX,
-                    "key": doc["id"],
-                    "doc_json": json.dumps(doc["data"]),
-                },
-            )
-            assert response.status_code == 200, (
-                f"保存文档失败: {response.json()}"
-            )
-
-        # 刷新索引确保数据可搜索
-        es_client.indices.refresh(index=self.TEST_INDEX)
+        # 批量插入：一次 bulk 请求写入全部文档，并立即刷新确保数据可搜索
+        helpers.bulk(
+            es_client,
+            (
+                {
+                    "_op_type": "index",
+                    "_index": self.TEST_INDEX,
+                    "_id": doc["id"],
+                    "_source": doc["data"],
+                }
+                for doc in test_documents
+            ),
+            refresh=True,
+        )
 
     # ===== 结构化搜索功能测试 =====
 
@@ -171,10 +167,10 @@ class TestStructuredSearch:
         )
 
         assert response.status_code == 200
-        data = response.json()
+        results = response.json()["results"]
 
         # 验证响应结构和数据
-        assert len(data["results"]) == 3  # 3个后端开发者
+        assert len(results) == 3  # 3个后端开发者
 
         # 验证具体结果
         backend_ids = {
@@ -182,11 +178,11 @@ class TestStructuredSearch:
             "backend_junior_1",
             "backend_senior_2",
         }
-        actual_ids = {result["id"] for result in data["results"]}
+        actual_ids = {result["id"] for result in results}
         assert actual_ids == backend_ids
 
         # 验证结果格式
-        for result in data["results"]:
+        for result in results:
             assert "id" in result
             assert "document" in result
             assert "score" in result
@@ -210,16 +206,16 @@ class TestStructuredSearch:
         )
 
         assert response.status_code == 200
-        data = response.json()
+        results = response.json()["results"]
 
-        assert len(data["results"]) == 2  # 2个高级后端开发者
+        assert len(results) == 2  # 2个高级后端开发者
 
         # 验证具体结果
         expected_ids = {"backend_senior_1", "backend_senior_2"}
-        actual_ids = {result["id"] for result in data["results"]}
+        actual_ids = {result["id"] for result in results}
         assert actual_ids == expected_ids
 
-        for result in data["results"]:
+        for result in results:
             assert result["document"]["role"] == "后端"
             assert result["document"]["level"] == "高级"
 
@@ -244,16 +240,13 @@ class TestStructuredSearch:
         )
 
         assert response.status_code == 200
-        data = response.json()
-        assert len(data["results"]) == 2
+        results = response.json()["results"]
+        assert len(results) == 2
 
         # 验证结果包含相关内容
-        found_mysql_doc = False
-        for result in data["results"]:
-            if "MySQL" in result["document"]["content"]:
-                found_mysql_doc = True
-                break
-        assert found_mysql_doc, "应该找到包含MySQL的文档"
+        assert any("MySQL" in r["document"]["content"] for r in results), (
+            "应该找到包含MySQL的文档"
+        )
 
     def test_multiple_full_text_match(self, client: TestClient) -> None:
         """测试多个全文搜索"""
@@ -273,12 +266,12 @@ class TestStructuredSearch:
         )
 
         assert response.status_code == 200
-        data = response.json()
+        results = response.json()["results"]
 
-        assert len(data["results"]) == 1
+        assert len(results) == 1
 
         # 验证AND关系：必须同时包含两个关键词
-        for result in data["results"]:
+        for result in results:
             content = result["document"]["content"]
             assert ("系" in content or "统" in content) and (
                 "模" in content or "式" in content
@@ -303,10 +296,10 @@ class TestStructuredSearch:
         )
 
         assert response.status_code == 200
-        data = response.json()
-        assert len(data["results"]) == 2
+        results = response.json()["results"]
+        assert len(results) == 2
 
-        for result in data["results"]:
+        for result in results:
             doc = result["document"]
             assert doc["role"] == "后端"
             assert doc["status"] == "active"
@@ -343,11 +336,11 @@ class TestStructuredSearch:
         )
 
         assert response.status_code == 200
-        data = response.json()
+        results = response.json()["results"]
 
-        assert len(data["results"]) == 3
+        assert len(results) == 3
 
-        for result in data["results"]:
+        for result in results:
             doc = result["document"]
             assert doc["department"] == "技术部"
             assert doc["level"] == "高级"
@@ -375,19 +368,19 @@ class TestStructuredSearch:
         )
 
         assert response.status_code == 200
-        data = response.json()
+        results = response.json()["results"]
 
-        assert len(data["results"]) == 2
+        assert len(results) == 2
 
         # 验证具体地期望结果
         expected_ids = {"backend_senior_1", "backend_senior_2"}
-        actual_ids = {result["id"] for result in data["results"]}
+        actual_ids = {result["id"] for result in results}
         assert actual_ids == expected_ids, (
             f"期望 {expected_ids}，实际 {actual_ids}"
         )
 
         # 验证过滤条件生效
-        for result in data["results"]:
+        for result in results:
             assert result["document"]["role"] == "后端"
             assert result["document"]["salary"] >= 20000
 
@@ -408,15 +401,13 @@ class TestStructuredSearch:
         )
 
         assert response.status_code == 200
-        data = response.json()
+        results = response.json()["results"]
 
-        assert len(data["results"]) <= 2  # 最多返回2个结果
-        assert (
-            len(data["results"]) == 2
-        )  # 应该正好有2个结果（因为有3个后端，限制为2）
+        # 3个后端被 top_k 截断为2个
+        assert len(results) == 2
 
         # 验证返回的都是后端
-        for result in data["results"]:
+        for result in results:
             assert result["document"]["role"] == "后端"
 
     def test_no_results_found(self, client: TestClient) -> None:
@@ -436,80 +427,64 @@ class TestStructuredSearch:
         )
 
         assert response.status_code == 200
-        data = response.json()
+        results = response.json()["results"]
 
-        assert len(data["results"]) == 0
+        assert len(results) == 0
 
     # ===== 参数验证测试 =====
     # 注：这些测试复用结构化搜索的测试环境
     # 如果向量混合搜索需要不同的校验规则，在vector_hybrid_search_test.py中单独添加
 
-    def test_invalid_type(self, client: TestClient) -> None:
-        """测试无效搜索类型"""
-        response = client.post(
-            "/api/v1/search",
-            json={
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            {
                 "type": "invalid_type",
                 "query": {
-                    "index": self.TEST_INDEX,
+                    "index": TEST_INDEX,
                     "conditions": [
                         {"field": "role", "op": "term", "value": "后端"}
                     ],
                 },
                 "top_k": 3,
             },
-        )
-
-        assert response.status_code == 422
-
-    def test_invalid_operator(self, client: TestClient) -> None:
-        """测试无效操作符"""
-        response = client.post(
-            "/api/v1/search",
-            json={
+            {
                 "type": "structured",
                 "query": {
-                    "index": self.TEST_INDEX,
+                    "index": TEST_INDEX,
                     "conditions": [
                         {"field": "role", "op": "invalid_op", "value": "后端"}
                     ],
                 },
                 "top_k": 3,
             },
-        )
-
-        assert response.status_code == 422
-
-    def test_missing_field_value(self, client: TestClient) -> None:
-        """测试缺少必需字段"""
-        response = client.post(
-            "/api/v1/search",
-            json={
+            {
                 "query": {
-                    "index": self.TEST_INDEX,
+                    "index": TEST_INDEX,
                     "conditions": [
                         {"field": "role", "op": "term", "value": ""}
                     ],
                 },
                 "top_k": 3,
             },
-        )
-
-        assert response.status_code == 422
-
-    def test_empty_conditions(self, client: TestClient) -> None:
-        """测试空条件列表"""
-        response = client.post(
-            "/api/v1/search",
-            json={
+            {
                 "type": "structured",
-                "query": {
-                    "index": self.TEST_INDEX,
-                    "conditions": [],
-                },
+                "query": {"index": TEST_INDEX, "conditions": []},
                 "top_k": 3,
             },
-        )
+        ],
+        ids=[
+            "invalid_type",
+            "invalid_operator",
+            "missing_field_value",
+            "empty_conditions",
+        ],
+    )
+    def test_invalid_request(
+        self, client: TestClient, payload: dict[str, Any]
+    ) -> None:
+        """测试无效搜索类型、无效操作符、缺少必需字段、空条件列表"""
+        response = client.post("/api/v1/search", json=payload)
 
         assert response.status_code == 422
 
@@ -12,7 +12,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import time
 from collections.abc import Callable
 from pathlib import Path
 
@@ -63,21 +62,15 @@ class TestUploadEndpoint:
         metadata_index = self._get_metadata_index_name(index_prefix)
         chunk_index = self._get_chunk_index_name(index_prefix)
 
-        # 刷新索引确保数据可见
-        es_client.indices.refresh(index=[metadata_index, chunk_index])
-
-        # 检查metadata索引
-        metadata_response = es_client.search(
-            index=metadata_index,
-            body={"query": {"match": {"name": expected_filename}}, "size": 10},
-        )
-        metadata_count = len(metadata_response["hits"]["hits"])
-
-        # 检查chunk索引
-        chunk_response = es_client.search(
-            index=chunk_index, body={"query": {"match_all": {}}, "size": 100}
+        # 写入链路使用 refresh="wait_for"，任务完成时数据即已可见，无需再手动刷新
+        # 只统计数量，不拉取 _source；chunk 数量也不受 size 截断
+        metadata_count = int(
+            es_client.count(
+                index=metadata_index,
+                query={"match": {"name": expected_filename}},
+            )["count"]
         )
-        chunk_count = len(chunk_response["hits"]["hits"])
+        chunk_count = int(es_client.count(index=chunk_index)["count"])
 
         return metadata_count, chunk_count
 
@@ -95,66 +88,19 @@ class TestUploadEndpoint:
         chunk_index = self._get_chunk_index_name(index_prefix)
 
         try:
-            if es_client.indices.exists(index=metadata_index):
-                es_client.indices.delete(index=metadata_index)
-            if es_client.indices.exists(index=chunk_index):
-                es_client.indices.delete(index=chunk_index)
+            es_client.indices.delete(
+                index=[metadata_index, chunk_index], ignore_unavailable=True
+            )
             print(f"✅ 已清理索引: {metadata_index}, {chunk_index}")
         except Exception as e:
             print(f"⚠️ 清理索引时出错: {e}")
 
-    def _wait_for_es_data(
-        self,
-        es_client: Elasticsearch,
-        index_prefix: str,
-        expected_filename: str,
-        max_wait_time: int = 15,
-        wait_interval: int = 2,
-    ) -> tuple[int, int]:
-        """
-        等待ES数据就绪
-
-        Args:
-            es_client: ES客户端
-            index_prefix: 索引前缀
-            expected_filename: 期望的文件名
-            max_wait_time: 最大等待时间(秒)
-            wait_interval: 检查间隔(秒)
-
-        Returns:
-            tuple: (metadata_count, chunk_count)
-        """
-        print(f"⏳ 等待数据处理完成... (最多等待{max_wait_time}秒)")
-
-        for attempt in range(max_wait_time // wait_interval):
-            time.sleep(wait_interval)
-
-            try:
-                metadata_count, chunk_count = self._verify_es_data_exists(
-                    es_client, index_prefix, expected_filename
-                )
-
-                if metadata_count > 0 and chunk_count > 0:
-                    print("✅ ES验证成功!")
-                    print(f"   📝 Metadata记录: {metadata_count}")
-                    print(f"   📄 Chunk记录: {chunk_count}")
-                    return metadata_count, chunk_count
-
-            except Exception as e:
-                print(f"⏳ 第{attempt + 1}次检查: 数据还未就绪 ({e})")
-
-        # 最后一次验证
-        metadata_count, chunk_count = self._verify_es_data_exists(
-            es_client, index_prefix, expected_filename
-        )
-
-        return metadata_count, chunk_count
-
     def test_upload_file(
         self,
         client: TestClient,
         es_client: Elasticsearch,
         get_user_upload_file: Callable[[str], Path],
+        wait_for_task: Callable[..., None],
     ) -> None:
         """测试文件上传功能并验证ES存储结果"""
 
@@ -199,8 +145,9 @@ class TestUploadEndpoint:
             print(f"✅ 文件上传成功，任务ID: {upload_result['task_id']}")
 
             # 步骤2: 等待异步处理完成并验证ES数据
-            metadata_count, chunk_count = self._wait_for_es_data(
-                es_client, index_prefix, test_file_name, max_wait_time=15
+            wait_for_task(upload_result["task_id"], timeout=15)
+            metadata_count, chunk_count = self._verify_es_data_exists(
+                es_client, index_prefix, test_file_name
             )
 
             # 断言数据存在
@@ -285,6 +232,7 @@ class TestUploadEndpoint:
         self,
         client: TestClient,
         es_client: Elasticsearch,
+        wait_for_task: Callable[..., None],
     ) -> None:
         """测试URL上传功能并验证ES存储结果"""
 
@@ -320,12 +268,9 @@ class TestUploadEndpoint:
             print(f"✅ URL上传成功，任务ID: {upload_result['task_id']}")
 
             # 步骤2: 等待异步处理完成并验证ES数据 (URL下载需要更长时间)
-            metadata_count, chunk_count = self._wait_for_es_data(
-                es_client,
-                index_prefix,
-                expected_filename,
-                max_wait_time=20,
-                wait_interval=3,
+            wait_for_task(upload_result["task_id"], timeout=20)
+            metadata_count, chunk_count = self._verify_es_data_exists(
+                es_client, index_prefix, expected_filename
             )
 
             # 断言数据存在
@@ -401,3 +346,19 @@ class TestUploadEndpoint:
         assert "detail" in error_detail
 
         print("✅ 无效URL验证通过!")
+
+    def test_task_status_long_poll(self, client: TestClient) -> None:
+        """测试任务状态长轮询参数"""
+
+        # 不存在的任务无需等待，立即返回 not_found
+        response = client.get(
+            "/api/v1/tasks/nonexistent_task", params={"wait": 30}
+        )
+        assert response.status_code == 200
+        assert response.json()["status"] == "not_found"
+
+        # 超出最长等待时间的参数被拒绝
+        response = client.get(
+            "/api/v1/tasks/nonexistent_task", params={"wait": 61}
+        )
+        assert response.status_code == 422
@@ -10,9 +10,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import time
-from collections.abc import Generator
-from pprint import pprint
+import logging
+from collections.abc import Callable, Generator
 from typing import Any
 
 import pytest
@@ -22,7 +21,10 @@ from httpx import Response
 
 from app.config.settings import settings
 
+logger = logging.getLogger(__name__)
 
+
+@pytest.mark.xdist_group("vector_hybrid_index")
 class TestVectorHybridSearch:
     """向量混合搜索测试
 
@@ -36,12 +38,15 @@ class TestVectorHybridSearch:
     """
 
     INDEX_PREFIX = "test_vector_hybrid_url"
+    # 搜索用例统一查询的分块索引名，类定义时计算一次
+    CHUNK_INDEX = INDEX_PREFIX + settings.elasticsearch.chunk_index_suffix
 
     @pytest.fixture(scope="class", autouse=True)
     def setup_environment(
         self,
         client: TestClient,
         es_client: Elasticsearch,
+        wait_for_task: Callable[..., None],
     ) -> Generator[None, Any]:
         """准备测试环境（索引+数据）"""
 
@@ -49,7 +54,9 @@ class TestVectorHybridSearch:
         self._cleanup_indexes(es_client, self.INDEX_PREFIX)
 
         # 2. 准备测试数据
-        self._prepare_test_data(client, es_client, self.INDEX_PREFIX)
+        self._prepare_test_data(
+            client, es_client, wait_for_task, self.INDEX_PREFIX
+        )
 
         # 3. 执行所有测试
         yield
@@ -65,12 +72,11 @@ class TestVectorHybridSearch:
         chunk_index = self._get_chunk_index_name(index_prefix)
 
         try:
-            if es_client.indices.exists(index=metadata_index):
-                es_client.indices.delete(index=metadata_index)
-            if es_client.indices.exists(index=chunk_index):
-                es_client.indices.delete(index=chunk_index)
+            es_client.indices.delete(
+                index=[metadata_index, chunk_index], ignore_unavailable=True
+            )
         except Exception as e:
-            print(f"⚠️ 清理索引时出错: {e}")
+            logger.warning("⚠️ 清理索引时出错: %s", e)
 
     @staticmethod
     def _get_metadata_index_name(index_prefix: str) -> str:
@@ -86,22 +92,27 @@ class TestVectorHybridSearch:
         self,
         client: TestClient,
         es_client: Elasticsearch,
+        wait_for_task: Callable[..., None],
         index_prefix: str,
     ) -> None:
         """准备向量混合搜索测试数据"""
 
-        print("\n🚀 开始准备向量混合搜索测试环境")
-        print(f"🔗 URL上传索引前缀: {self.INDEX_PREFIX}")
+        logger.info(
+            "🚀 开始准备向量混合搜索测试环境, URL上传索引前缀: %s",
+            self.INDEX_PREFIX,
+        )
 
         # 通过URL上传准备数据
-        self._upload_test_url(client)
+        self._upload_test_url(client, wait_for_task)
 
-        # 等待数据处理完成
-        self._wait_for_test_data_ready(index_prefix, es_client)
+        # 校验数据已可搜索
+        self._assert_test_data_ready(index_prefix, es_client)
 
-        print("✅ 向量搜索测试数据准备完成")
+        logger.info("✅ 向量搜索测试数据准备完成")
 
-    def _upload_test_url(self, client: TestClient) -> None:
+    def _upload_test_url(
+        self, client: TestClient, wait_for_task: Callable[..., None]
+    ) -> None:
         """通过URL上传准备测试数据"""
         bucket_name = settings.tencent_oss.bucket
         cos_url = f"https://{bucket_name}.cos.{settings.tencent_oss.region}.myqcloud.com/kbase-temp/02_test.pdf"
@@ -116,56 +127,29 @@ class TestVectorHybridSearch:
 
         assert response.status_code == 200, f"URL上传失败: {response.json()}"
         task_id = response.json()["task_id"]
-        print(f"🔗 URL上传任务创建成功: {task_id}")
-        self._wait_for_task_completion(client, task_id)
+        logger.info("🔗 URL上传任务创建成功: %s", task_id)
+        wait_for_task(task_id)
 
-    @staticmethod
-    def _wait_for_task_completion(
-        client: TestClient, task_id: str, max_wait: int = 30
-    ) -> None:
-        """等待后台任务完成"""
-        for _ in range(max_wait):
-            response = client.get(f"/api/v1/tasks/{task_id}")
-            if response.status_code == 200:
-                status = response.json()["status"]
-                if status == "completed":
-                    return
-                elif status.startswith("failed"):
-                    pytest.fail(f"任务处理失败: {status}")
-            time.sleep(1)
-        pytest.fail(f"任务处理超时: {task_id}")
-
-    def _wait_for_test_data_ready(
+    def _assert_test_data_ready(
         self, index_prefix: str, es_client: Elasticsearch
     ) -> None:
-        """等待测试数据就绪"""
-        print("⏳ 等待上传任务完成和数据索引...")
-
-        max_wait_time = 30
-        start_time = time.time()
-
-        while time.time() - start_time < max_wait_time:
-            # 检查URL上传索引
-            url_metadata_count = self._get_index_doc_count(
-                es_client, self._get_metadata_index_name(index_prefix)
-            )
-            url_chunk_count = self._get_index_doc_count(
-                es_client, self._get_chunk_index_name(index_prefix)
-            )
-
-            print(
-                f"📊 当前数据统计: URL上传(metadata: {url_metadata_count}, chunks: {url_chunk_count}) "
-            )
-
-            # 检查是否都有数据了
-            if url_metadata_count > 0 and url_chunk_count > 0:
-                print("✅ 所有上传任务完成")
-                return
+        """校验测试数据已可搜索
 
-            time.sleep(2)
-
-        # 超时但尽量继续测试
-        print("⚠️ 等待上传超时，但继续进行测试")
+        写入链路使用 refresh="wait_for"，任务完成时数据即已可见，无需轮询等待
+        """
+        metadata_count = self._get_index_doc_count(
+            es_client, self._get_metadata_index_name(index_prefix)
+        )
+        chunk_count = self._get_index_doc_count(
+            es_client, self._get_chunk_index_name(index_prefix)
+        )
+        logger.info(
+            "📊 当前数据统计: URL上传(metadata: %d, chunks: %d)",
+            metadata_count,
+            chunk_count,
+        )
+        assert metadata_count > 0, "任务完成后元数据索引应有数据"
+        assert chunk_count > 0, "任务完成后分块索引应有数据"
 
     @staticmethod
     def _get_index_doc_count(es_client: Elasticsearch, index_name: str) -> int:
@@ -173,14 +157,11 @@ class TestVectorHybridSearch:
         if not es_client.indices.exists(index=index_name):
             return 0
 
-        # 刷新索引确保数据可见
-        es_client.indices.refresh(index=index_name)
-
         try:
             response = es_client.count(index=index_name)
             return int(response["count"])
         except Exception as e:
-            print(f"获取索引中文档总数失败：{e}")
+            logger.warning("获取索引中文档总数失败：%s", e)
             return 0
 
     # ===== 向量混合搜索功能测试 =====
@@ -193,7 +174,7 @@ class TestVectorHybridSearch:
             json={
                 "type": "vector_hybrid",
                 "query": {
-                    "index": self._get_chunk_index_name(self.INDEX_PREFIX),
+                    "index": self.CHUNK_INDEX,
                     "conditions": [
                         {
                             "field": "content",
@@ -205,7 +186,7 @@ class TestVectorHybridSearch:
                 "top_k": 3,
             },
         )
-        pprint(f"查询字段：{value}")
+        logger.debug("查询字段：%s", value)
         self._assert_response(response)
 
     @staticmethod
@@ -225,7 +206,6 @@ class TestVectorHybridSearch:
             # 不应该包含StructuredSearchResult的字段
             assert "id" not in result
             assert "document" not in result
-            pprint(result)
 
     def test_semantic_similarity(self, client: TestClient) -> None:
         """测试语义相似性搜索"""
@@ -235,7 +215,7 @@ class TestVectorHybridSearch:
             json={
                 "type": "vector_hybrid",
                 "query": {
-                    "index": self._get_chunk_index_name(self.INDEX_PREFIX),
+                    "index": self.CHUNK_INDEX,
                     "conditions": [
                         {
                             "field": "content",
@@ -247,7 +227,7 @@ class TestVectorHybridSearch:
                 "top_k": 2,
             },
         )
-        pprint(f"查询字段：{value}")
+        logger.debug("查询字段：%s", value)
         self._assert_response(response)
 
     # ===== 参数验证测试 =====
@@ -259,7 +239,7 @@ class TestVectorHybridSearch:
             json={
                 "type": "vector_hybrid",
                 "query": {
-                    "index": self._get_chunk_index_name(self.INDEX_PREFIX),
+                    "index": self.CHUNK_INDEX,
                     "conditions": [
                         {"field": "content", "op": "match", "value": "Python"},
                         {
@@ -282,7 +262,7 @@ class TestVectorHybridSearch:
             json={
                 "type": "vector_hybrid",
                 "query": {
-                    "index": self._get_chunk_index_name(self.INDEX_PREFIX),
+                    "index": self.CHUNK_INDEX,
                     "conditions": [
                         {"field": "content", "op": "term", "value": "Python"}
                     ],
@@ -300,7 +280,7 @@ class TestVectorHybridSearch:
             json={
                 "type": "vector_hybrid",
                 "query": {
-                    "index": self._get_chunk_index_name(self.INDEX_PREFIX),
+                    "index": self.CHUNK_INDEX,
                     "conditions": [
                         {"field": "content", "op": "match", "value": ""}
                     ],
@@ -336,14 +316,14 @@ class TestVectorHybridSearch:
         """测试带过滤条件的向量混合搜索"""
         value = "缓存"
         chunk_index_number = self._get_index_doc_count(
-            es_client, self._get_chunk_index_name(self.INDEX_PREFIX)
+            es_client, self.CHUNK_INDEX
         )
         response = client.post(
             "/api/v1/search",
             json={
                 "type": "vector_hybrid",
                 "query": {
-                    "index": self._get_chunk_index_name(self.INDEX_PREFIX),
+                    "index": self.CHUNK_INDEX,
                     "conditions": [
                         {"field": "content", "op": "match", "value": value}
                     ],
@@ -357,36 +337,47 @@ class TestVectorHybridSearch:
             },
         )
 
-        pprint(f"查询字段：{value}")
+        logger.debug("查询字段：%s", value)
         assert response.status_code == 200
         data = response.json()
         assert isinstance(data["results"], list)
         assert len(data["results"]) == 1
-        pprint(f"{data['results']}")
+        logger.debug("搜索结果：%s", data["results"])
 
     def test_top_k_limit(self, client: TestClient) -> None:
-        """测试top_k参数限制"""
-        for top_k in [1, 2, 3]:
-            response = client.post(
-                "/api/v1/search",
-                json={
-                    "type": "vector_hybrid",
-                    "query": {
-                        "index": self._get_chunk_index_name(self.INDEX_PREFIX),
-                        "conditions": [
-                            {"field": "content", "op": "match", "value": "中心"}
-                        ],
-                    },
-                    "top_k": top_k,
-                },
-            )
+        """测试top_k参数限制（多个top_k合并为一次批量搜索请求）"""
+        top_ks = [1, 2, 3]
+        response = client.post(
+            "/api/v1/search/batch",
+            json={
+                "requests": [
+                    {
+                        "type": "vector_hybrid",
+                        "query": {
+                            "index": self.CHUNK_INDEX,
+                            "conditions": [
+                                {
+                                    "field": "content",
+                                    "op": "match",
+                                    "value": "中心",
+                                }
+                            ],
+                        },
+                        "top_k": top_k,
+                    }
+                    for top_k in top_ks
+                ]
+            },
+        )
 
-            assert response.status_code == 200
-            data = response.json()
-            assert isinstance(data["results"], list)
-            assert len(data["results"]) <= top_k
-            print(
-                f"📊 Top-K={top_k} 限制测试通过: 返回 {len(data['results'])} 个结果"
+        assert response.status_code == 200
+        responses = response.json()["responses"]
+        assert len(responses) == len(top_ks)
+        for top_k, resp in zip(top_ks, responses, strict=True):
+            assert isinstance(resp["results"], list)
+            assert len(resp["results"]) <= top_k
+            logger.debug(
+                "📊 Top-K=%d 返回 %d 个结果", top_k, len(resp["results"])
             )
 
     def test_score_ordering(self, client: TestClient) -> None:
@@ -396,7 +387,7 @@ class TestVectorHybridSearch:
             json={
                 "type": "vector_hybrid",
                 "query": {
-                    "index": self._get_chunk_index_name(self.INDEX_PREFIX),
+                    "index": self.CHUNK_INDEX,
                     "conditions": [
                         {"field": "content", "op": "match", "value": "缓存"}
                     ],
@@ -411,4 +402,4 @@ class TestVectorHybridSearch:
         # 验证分数降序排列
         scores = [result["score"] for result in data["results"]]
         assert scores == sorted(scores, reverse=True), "结果应该按分数降序排列"
-        print(f"📊 分数排序验证通过: {scores}")
+        logger.debug("📊 分数排序: %s", scores)